@@ -11,121 +11,272 @@ Lazy implementation:
 
 Eager implementation:
     The eager version avoids inserting duplicate key-value pairs.
+
+One-to-many implementation:
+    Computes the distances from one vertex to a set of targets and stops
+    as soon as every target has been settled. It works on the adjacency
+    lists of a graph only, which makes it cheap to ship to worker processes.
+
+Masked implementation:
+    Finds a shortest path while ignoring a set of vertices and edges without
+    modifying the graph, as needed by the spur searches of k-shortest paths.
+
+All implementations keep their per-query state in a SearchSpace, which is
+reused between queries instead of being allocated for the whole graph, so
+short queries on large graphs only pay for the vertices they reach.
 """
+from __future__ import annotations
+from collections.abc import Container, Iterable, Mapping
 from heapq import heappop, heappush
 from queue import PriorityQueue
-from data_structures import Edge, Graph, Vertex
+from data_structures import Graph, SearchSpace, ShortestPath, Vertex
 
 
-def dijkstra_lazy(graph: Graph, start: Vertex, destination: Vertex) -> None:
+def dijkstra_lazy(graph: Graph, start: Vertex, destination: Vertex) -> ShortestPath | None:
     """Dijktra's shortest path with priority queue.
 
     Args:
         graph: A graph with edges and vertices.
         start: The start vertex.
         destination: The destination vertex.
+
+    Returns:
+        The shortest path, or None if the destination is unreachable.
+
+    Raises:
+        KeyError: If start or destination is not part of the graph.
     """
+    start_id = graph.ids[start]
+    destination_id = graph.ids[destination]
     queue = PriorityQueue()
-    queue.put((0, start))
-    came_from = {}
+    queue.put((0, start_id))
+    adjacency = graph.adjacency
 
-    costs = dict.fromkeys(graph.vertices, float('inf'))
-    costs[start] = 0
+    with graph.search_space(start_id) as space:
+        costs = space.costs
+        came_from = space.came_from
+        reached = space.reached
+        visited = space.settled
+        version = space.version
 
-    while not queue.empty():
-        current = queue.get()[1]
+        while not queue.empty():
+            current = queue.get()[1]
 
-        # Destinaton reached
-        if current == destination:
-            reconstruct_path(came_from, destination, costs)
-            return
+            # Destinaton reached
+            if current == destination_id:
+                return ShortestPath(graph, space, current, costs[current])
 
-        current.visited = True
+            visited[current] = version
 
-        # Check all neighbors
-        for edge in current.adjacent_edges:
-            if edge.destination.visited: continue
-            new_cost = costs[current] + edge.cost
+            # Check all neighbors
+            for neighbor, cost in adjacency[current]:
+                if visited[neighbor] == version: continue
+                new_cost = costs[current] + cost
 
-            if new_cost < costs[edge.destination]:
-                came_from[edge.destination] = current
-                costs[edge.destination] = new_cost
-                queue.put((costs[edge.destination], edge.destination))
+                if reached[neighbor] != version or new_cost < costs[neighbor]:
+                    reached[neighbor] = version
+                    came_from[neighbor] = current
+                    costs[neighbor] = new_cost
+                    queue.put((new_cost, neighbor))
 
-    print(f'No path from {start.name} to {destination.name} was found.')
+    return None
 
 
-def dijkstra_eager(graph: Graph, start: Vertex, destination: Vertex) -> None:
+def dijkstra_eager(graph: Graph, start: Vertex, destination: Vertex) -> ShortestPath | None:
     """Dijktra's shortest path with heapqueue.
 
     Args:
         graph: A graph with edges and vertices.
         start: The start vertex.
         destination: The destination vertex.
+
+    Returns:
+        The shortest path, or None if the destination is unreachable.
+
+    Raises:
+        KeyError: If start or destination is not part of the graph.
     """
+    start_id = graph.ids[start]
+    destination_id = graph.ids[destination]
+    heap = [(0, start_id)]
+    adjacency = graph.adjacency
+
+    with graph.search_space(start_id) as space:
+        costs = space.costs
+        came_from = space.came_from
+        heap_vertices = space.reached
+        visited = space.settled
+        version = space.version
+
+        while heap:
+            min_value, current = heappop(heap)
+
+            # Destinaton reached
+            if current == destination_id:
+                return ShortestPath(graph, space, current, costs[current])
+
+            visited[current] = version
+
+            if costs[current] < min_value: continue
+
+            # Check all neighbors
+            for neighbor, cost in adjacency[current]:
+                if visited[neighbor] == version: continue
+                new_cost = costs[current] + cost
+
+                if heap_vertices[neighbor] != version:
+                    heap_vertices[neighbor] = version
+                    came_from[neighbor] = current
+                    costs[neighbor] = new_cost
+                    heappush(heap, (new_cost, neighbor))
+                elif new_cost < costs[neighbor]:
+                    decrease_key(heap, neighbor, new_cost, costs[neighbor])
+                    came_from[neighbor] = current
+                    costs[neighbor] = new_cost
+
+    return None
+
+
+def dijkstra_distances(
+    adjacency: list[list[tuple[int, int]]],
+    start: int,
+    targets: Iterable[int] | None = None,
+    space: SearchSpace | None = None,
+) -> SearchSpace:
+    """Dijkstra's one-to-many distances with early termination.
+
+    Args:
+        adjacency: The adjacency lists of a graph, see Graph.adjacency.
+        start: The id of the start vertex.
+        targets: Ids of the vertices we need distances for. The search stops
+            once all of them are settled. If None, the whole graph is searched.
+        space: A search space for len(adjacency) vertices to reuse for
+            consecutive searches. If None, a new one is created.
+
+    Returns:
+        The search space holding the costs and predecessors of all reached
+        vertices. Targets are exact, other vertices might only hold an upper bound.
+    """
+    if space is None:
+        space = SearchSpace(len(adjacency))
+
+    version = space.reset(start)
+    costs = space.costs
+    came_from = space.came_from
+    reached = space.reached
+    visited = space.settled
     heap = [(0, start)]
-    heap_vertices = set()
-    came_from = {}
 
-    costs = dict.fromkeys(graph.vertices, float('inf'))
-    costs[start] = 0
+    if targets is None:
+        remaining = len(adjacency)
+    else:
+        targets = set(targets)
+        remaining = len(targets)
 
-    while heap:
+    while heap and remaining:
         min_value, current = heappop(heap)
+        if visited[current] == version: continue
+        visited[current] = version
+
+        if targets is None or current in targets:
+            remaining -= 1
+
+        for neighbor, cost in adjacency[current]:
+            new_cost = min_value + cost
+
+            if reached[neighbor] != version or new_cost < costs[neighbor]:
+                reached[neighbor] = version
+                costs[neighbor] = new_cost
+                came_from[neighbor] = current
+                heappush(heap, (new_cost, neighbor))
+
+    return space
 
-        # Destinaton reached
-        if current == destination:
-            reconstruct_path(came_from, destination, costs)
-            return
 
-        current.visited = True
+def dijkstra_masked(
+    graph: Graph,
+    start: int,
+    destination: int,
+    blocked_vertices: list[bool] | None = None,
+    blocked_edges: Mapping[int, Container[int]] | None = None,
+) -> ShortestPath | None:
+    """Dijkstra's shortest path that skips masked vertices and edges.
 
-        if costs[current] < min_value: continue
+    Args:
+        graph: A graph with edges and vertices.
+        start: The id of the start vertex.
+        destination: The id of the destination vertex.
+        blocked_vertices: Flags indexed by id of vertices the path must not visit.
+        blocked_edges: Maps a vertex id to the ids of the vertices that must
+            not be reached directly from it.
+
+    Returns:
+        The shortest path, or None if the destination is unreachable.
+    """
+    if blocked_edges is None:
+        blocked_edges = {}
+
+    heap = [(0, start)]
+    adjacency = graph.adjacency
+
+    with graph.search_space(start) as space:
+        costs = space.costs
+        came_from = space.came_from
+        reached = space.reached
+        visited = space.settled
+        version = space.version
+
+        while heap:
+            min_value, current = heappop(heap)
 
-        # Check all neighbors
-        for edge in current.adjacent_edges:
-            if edge.destination.visited: continue
-            new_cost = costs[current] + edge.cost
-            current_cost = costs[edge.destination]
+            # Destinaton reached
+            if current == destination:
+                return ShortestPath(graph, space, current, min_value)
 
-            if new_cost < current_cost:
-                came_from[edge.destination] = current
-                costs[edge.destination] = new_cost
+            if visited[current] == version: continue
+            visited[current] = version
+            blocked = blocked_edges.get(current)
 
-                if edge.destination not in heap_vertices:
-                    heap_vertices.add(edge.destination)
-                    heappush(heap, (costs[edge.destination], edge.destination))
-                else:
-                    decrease_key(heap, edge, costs[edge.destination], current_cost)
+            # Check all neighbors
+            for neighbor, cost in adjacency[current]:
+                if visited[neighbor] == version or (blocked_vertices and blocked_vertices[neighbor]): continue
+                if blocked and neighbor in blocked: continue
+                new_cost = min_value + cost
 
-    print(f'No path from {start.name} to {destination.name} was found.')
+                if reached[neighbor] != version or new_cost < costs[neighbor]:
+                    reached[neighbor] = version
+                    came_from[neighbor] = current
+                    costs[neighbor] = new_cost
+                    heappush(heap, (new_cost, neighbor))
 
+    return None
 
-def decrease_key(heap: list[tuple[int, Vertex]], edge: Edge, new_cost: int, current_cost: int) -> None:
-    """Decrease a value of a vertex given a edge.
+
+def decrease_key(heap: list[tuple[int, int]], vertex: int, new_cost: int, current_cost: int) -> None:
+    """Decrease the value of a vertex in the heap.
 
     Since the heapq module doesn't support a decrease key method
     with O(1) lookup, we iterate over the heap in O(V) as a workaround.
 
     Args:
-        heap: An array of tuples containing the cost and vertex.
-        edge: The current edge we're considering.
+        heap: An array of tuples containing the cost and vertex id.
+        vertex: The id of the vertex whose cost decreased.
         new_cost: The new distance from vertex A to vertex B.
         current_cost: The current distance from vertex A to vertex B.
     """
     for i in range(len(heap)):
-        if heap[i] == (current_cost, edge.destination):
-            heap[i] = (new_cost, edge.destination)
+        if heap[i] == (current_cost, vertex):
+            heap[i] = (new_cost, vertex)
             break
 
     swim(heap, 0, i)
 
 
-def swim(heap: list[tuple[int, Vertex]], start_position: int, position: int) -> None:
+def swim(heap: list[tuple[int, int]], start_position: int, position: int) -> None:
     """Restore the heap invariant.
 
     Args:
-        heap: An array of tuples containing the cost and vertex.
+        heap: An array of tuples containing the cost and vertex id.
         start_position: The index of the root.
         position: The index of the updated tuple.
     """
@@ -144,20 +295,3 @@ def swim(heap: list[tuple[int, Vertex]], start_position: int, position: int) ->
 
     heap[position] = new_item
 
-
-def reconstruct_path(came_from: dict[Vertex, Vertex], current: Vertex, costs: dict[int, Vertex]) -> None:
-    """Reconstruct the shortest path.
-
-    Args:
-        came_from: A dictionary containing the path to the destination.
-        current: The current vertex we're considering.
-        costs: A dictionary containing all of the costs.
-    """
-    print(f'Distance: {costs[current]}')
-    path = current.name
-
-    while current in came_from:
-        current = came_from[current]
-        path = f'{current.name} -> {path}'
-
-    print(f'Shortest Path: {path}')
@@ -0,0 +1,105 @@
+"""Measures how the time of a query depends on the size of the graph.
+
+Square grid graphs of growing size are searched with short queries between
+vertices a few steps apart and long queries between random vertices. The time
+of a long query grows with the graph since it settles most of it, while the
+time of a short query should only depend on the vertices it actually reaches.
+
+Typical usage example:
+    python benchmark.py
+    python benchmark.py --sizes 100 500 --queries 1000
+"""
+from __future__ import annotations
+import argparse
+import random
+from collections.abc import Callable
+from time import perf_counter
+from algorithms import dijkstra_eager, dijkstra_lazy, dijkstra_masked
+from data_structures import Edge, Graph, Vertex
+
+ALGORITHMS = {
+    'lazy': dijkstra_lazy,
+    'eager': dijkstra_eager,
+    'masked': lambda graph, start, destination: dijkstra_masked(graph, graph.ids[start], graph.ids[destination]),
+}
+
+
+def grid_graph(size: int, seed: int = 0) -> tuple[Graph, list[Vertex]]:
+    """Builds a size x size grid with random costs between 1 and 9 in both directions.
+
+    Returns:
+        The graph and its vertices in row-major order.
+    """
+    rng = random.Random(seed)
+    vertices = [Vertex(str(i)) for i in range(size * size)]
+    edges = set()
+
+    for i, vertex in enumerate(vertices):
+        row, col = divmod(i, size)
+        neighbors = []
+        if col < size - 1: neighbors.append(vertices[i + 1])
+        if row < size - 1: neighbors.append(vertices[i + size])
+
+        for neighbor in neighbors:
+            cost = rng.randint(1, 9)
+            edges.add(Edge(vertex, neighbor, cost))
+            edges.add(Edge(neighbor, vertex, cost))
+
+    return Graph(set(vertices), edges), vertices
+
+
+def query_pairs(
+    vertices: list[Vertex],
+    size: int,
+    count: int,
+    span: int | None,
+    seed: int = 0,
+) -> list[tuple[Vertex, Vertex]]:
+    """Picks start and destination pairs at most span rows and columns apart, or anywhere if span is None."""
+    rng = random.Random(seed)
+    pairs = []
+
+    for _ in range(count):
+        row, col = rng.randrange(size), rng.randrange(size)
+
+        if span is None:
+            other_row, other_col = rng.randrange(size), rng.randrange(size)
+        else:
+            other_row = min(size - 1, max(0, row + rng.randint(-span, span)))
+            other_col = min(size - 1, max(0, col + rng.randint(-span, span)))
+
+        pairs.append((vertices[row * size + col], vertices[other_row * size + other_col]))
+
+    return pairs
+
+
+def time_queries(graph: Graph, algorithm: Callable, pairs: list[tuple[Vertex, Vertex]]) -> float:
+    """Returns the mean time of a query in seconds."""
+    started = perf_counter()
+    for start, destination in pairs:
+        algorithm(graph, start, destination)
+    return (perf_counter() - started) / len(pairs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 500], help='rows and columns of the grids')
+    parser.add_argument('--queries', type=int, default=500, help='number of short queries per grid')
+    parser.add_argument('--span', type=int, default=3, help='maximum distance of short queries in rows and columns')
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    args = parser.parse_args()
+
+    print(f'{"Vertices":>10}' + ''.join(f'{name + " short":>14}{name + " long":>14}' for name in args.algorithms))
+
+    for size in args.sizes:
+        graph, vertices = grid_graph(size)
+        short_pairs = query_pairs(vertices, size, args.queries, args.span)
+        long_pairs = query_pairs(vertices, size, max(1, args.queries * 100 // (size * size)), None)
+        row = f'{size * size:>10}'
+
+        for name in args.algorithms:
+            short = time_queries(graph, ALGORITHMS[name], short_pairs)
+            long = time_queries(graph, ALGORITHMS[name], long_pairs)
+            row += f'{short * 1e6:>11.1f} us{long * 1e3:>11.1f} ms'
+
+        print(row)
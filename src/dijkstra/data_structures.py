@@ -3,8 +3,18 @@
 Together, they are used to represent a directed graph with vertices (also known as 'nodes')
 and edges. Each edge connects two vertices and has a cost, which might represent distance,
 difficulty or any kind of rating (the higher, the less desireable the path).
+
+When a graph is created, it assigns every vertex a dense integer id. The ids belong
+to the graph, not the vertex, so a vertex may be part of several graphs. The algorithms
+work on these ids only, so all per-query state can live in flat lists indexed by id
+instead of dictionaries keyed by vertex objects. These lists are allocated once per
+graph and reused by later queries, so a query only pays for the vertices it reaches.
 """
 from __future__ import annotations
+from collections.abc import Iterator
+from contextlib import contextmanager
+from sys import intern
+from weakref import ref
 
 
 class Vertex:
@@ -13,13 +23,13 @@ class Vertex:
     Attributes:
         name: Name of the vertex.
         adjacent_edges: Neighbors of a vertex.
-        visited: Flag if the vertex has been visited.
     """
+    __slots__ = ('name', 'adjacent_edges')
+
     def __init__(self, name: str) -> None:
         """Initializes a Vertex object."""
-        self.name = name
+        self.name = intern(name)
         self.adjacent_edges = set()
-        self.visited = False
 
     def set_adjacent_edges(self, edges: set[Edge]) -> None:
         """Initializes all edges leading away from this vertex."""
@@ -40,6 +50,8 @@ class Edge:
         end: Vertex towards which the edge leads.
         cost: Path costs of the respective edge.
     """
+    __slots__ = ('start', 'destination', 'cost')
+
     def __init__(self, start: Vertex, destination: Vertex, cost: int) -> None:
         """Initializes an Edge object."""
         self.start = start
@@ -47,12 +59,76 @@ class Edge:
         self.cost = cost
 
 
+class SearchSpace:
+    """Holds the per-query state of a search, reused across queries.
+
+    Rather than clearing the lists before every query, each query gets a new
+    version. An entry only counts if the stamp of its vertex equals the current
+    version, so resetting takes O(1) and stale entries are simply ignored.
+
+    Attributes:
+        costs: Tentative cost of each vertex id, valid if it was reached.
+        came_from: Predecessor id of each vertex id, valid if it was reached.
+        reached: Version in which each vertex id was last reached.
+        settled: Version in which each vertex id was last settled.
+        version: Version of the current query.
+        path: Weak reference to a path which still reads its vertices from came_from, or None.
+    """
+    __slots__ = ('costs', 'came_from', 'reached', 'settled', 'version', 'path')
+
+    def __init__(self, size: int) -> None:
+        """Initializes a SearchSpace object for size vertices."""
+        self.costs = [0] * size
+        self.came_from = [-1] * size
+        self.reached = [0] * size
+        self.settled = [0] * size
+        self.version = 0
+        self.path = None
+
+    def reset(self, start: int) -> int:
+        """Starts a new query at the start vertex id and returns its version.
+
+        A path of the previous query which is still in use and hasn't read its
+        vertices yet does so now, before its predecessors are overwritten.
+        """
+        path = self.path and self.path()
+        if path:
+            path.detach()
+
+        self.version += 1
+        self.costs[start] = 0
+        self.came_from[start] = -1
+        self.reached[start] = self.version
+        return self.version
+
+    def cost(self, vertex_id: int) -> float:
+        """Returns the cost of a vertex id in the current query, infinity if it wasn't reached."""
+        return self.costs[vertex_id] if self.reached[vertex_id] == self.version else float('inf')
+
+    def path_to(self, destination: int) -> tuple[int, ...]:
+        """Returns the vertex ids from the start to a reached destination."""
+        vertex_ids = []
+        current = destination
+
+        while current != -1:
+            vertex_ids.append(current)
+            current = self.came_from[current]
+
+        vertex_ids.reverse()
+        return tuple(vertex_ids)
+
+
 class Graph:
     """Represents a weighted graph consisting of vertices and edges.
 
     Attributes:
         vertices: List of all vertices the graph contains.
         edges: List of all edges the graph contains.
+        ids: Maps every vertex to its id in this graph.
+        names: Side table mapping vertex ids to vertex names.
+        adjacency: Outgoing (destination id, cost) pairs for each vertex id.
+        _out_edges: Outgoing edges for each vertex id.
+        _search_spaces: Search spaces which are not in use by a query.
     """
     def __init__(self, vertices: set[Vertex], edges: set[Edge]) -> None:
         """Initializes a Graph object.
@@ -68,6 +144,132 @@ class Graph:
                     f'Edge {edge.start} to {edge.destination} contains a vertex that is not part of this graph.')
 
         self.edges = edges
+        self.ids = {vertex: vertex_id for vertex_id, vertex in enumerate(self.vertices)}
+        self.names = [vertex.name for vertex in self.ids]
+        self.adjacency = [[] for _ in self.names]
+        self._out_edges = [[] for _ in self.names]
+
+        for edge in self.edges:
+            start = self.ids[edge.start]
+            edge.start.adjacent_edges.add(edge)
+            self.adjacency[start].append((self.ids[edge.destination], edge.cost))
+            self._out_edges[start].append(edge)
+
+        self._search_spaces = []
+
+    @contextmanager
+    def search_space(self, start: int) -> Iterator[SearchSpace]:
+        """Lends a search space for a query from the start vertex id.
+
+        Concurrent or nested queries each get their own search space, which is
+        created on first use and kept for later queries afterwards.
+        """
+        try:
+            space = self._search_spaces.pop()
+        except IndexError:
+            space = SearchSpace(len(self.names))
+
+        space.reset(start)
+
+        try:
+            yield space
+        finally:
+            self._search_spaces.append(space)
+
+    def find_edge(self, start: int, destination: int) -> Edge:
+        """Returns the cheapest edge leading from one vertex id to another.
+
+        Raises:
+            KeyError: If there is no edge between the two vertices.
+        """
+        candidates = [edge for edge in self._out_edges[start] if self.ids[edge.destination] == destination]
+
+        if not candidates:
+            raise KeyError(f'No edge from {self.names[start]} to {self.names[destination]}.')
+
+        return min(candidates, key=lambda edge: edge.cost)
+
+
+class ShortestPath:
+    """Represents a shortest path found by one of the algorithms.
+
+    The vertices of the path are either known up front, or reconstructed from
+    the search space of the query the first time they are requested. If the
+    search space is reused before that, the path reads its vertices right
+    before they are overwritten. The edges are only looked up when requested,
+    so callers who only need the distance never pay for them.
+
+    Attributes:
+        graph: The graph that was searched.
+        distance: Total cost of the path.
+        destination: Id of the last vertex of the path.
+    """
+    __slots__ = ('graph', 'distance', 'destination', '_space', '_vertex_ids', '_edges', '__weakref__')
+
+    def __init__(self, graph: Graph, space: SearchSpace | None, destination: int, distance: int) -> None:
+        """Initializes a ShortestPath object.
+
+        Args:
+            graph: The graph that was searched.
+            space: The search space of the query which found the path.
+            destination: Id of the last vertex of the path.
+            distance: Total cost of the path.
+        """
+        self.graph = graph
+        self.distance = distance
+        self.destination = destination
+        self._space = space
+        self._vertex_ids = None
+        self._edges = None
+
+        if space is not None:
+            space.path = ref(self)
+
+    @classmethod
+    def from_vertex_ids(cls, graph: Graph, vertex_ids: tuple[int, ...], distance: int) -> ShortestPath:
+        """Creates a path from an already known sequence of vertex ids."""
+        path = cls(graph, None, vertex_ids[-1], distance)
+        path._vertex_ids = vertex_ids
+        return path
+
+    @property
+    def vertex_ids(self) -> tuple[int, ...]:
+        """Ids of the vertices on the path, from start to destination."""
+        if self._vertex_ids is None:
+            self.detach()
+
+        return self._vertex_ids
+
+    def detach(self) -> None:
+        """Reads the vertices from the search space, which may be reused afterwards."""
+        if self._space is not None:
+            self._vertex_ids = self._space.path_to(self.destination)
+            self._space.path = None
+            self._space = None
+
+    @property
+    def edges(self) -> tuple[Edge, ...]:
+        """Edges along the path, from start to destination."""
+        if self._edges is None:
+            vertex_ids = self.vertex_ids
+            self._edges = tuple(self.graph.find_edge(vertex_ids[i - 1], vertex_ids[i]) for i in range(1, len(vertex_ids)))
+
+        return self._edges
+
+    @property
+    def names(self) -> list[str]:
+        """Names of the vertices on the path, from start to destination."""
+        names = self.graph.names
+        return [names[vertex_id] for vertex_id in self.vertex_ids]
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterates over the vertex ids of the path without copying them."""
+        return iter(self.vertex_ids)
+
+    def __len__(self) -> int:
+        """Number of vertices on the path."""
+        return len(self.vertex_ids)
 
-        for vertex in self.vertices:
-            vertex.set_adjacent_edges(self.edges)
+    def __str__(self) -> str:
+        """Formats the path as 'A -> B -> C'."""
+        return ' -> '.join(self.names)
@@ -0,0 +1,177 @@
+"""Finds the k shortest loopless paths between two vertices (Yen's algorithm).
+
+Yen's algorithm derives every new path from the previously found one: each
+vertex of that path is used once as a spur vertex, from which a masked
+Dijkstra search looks for a detour. The part of the path before the spur
+vertex (the root) may not be revisited, and the edges other found paths take
+after the same root are blocked.
+
+Rather than copying the graph for every spur search, vertices and edges are
+masked through flags and lookup tables. The roots of all found paths are kept
+in a trie, so the edges to block after a root are looked up instead of
+recomputed. Following Lawler, spur vertices before the point where a path
+deviated from its parent are skipped, since their detours were already found
+when the parent was expanded.
+
+The shortest path tree towards the destination is computed once on the
+reversed graph. Its distances guide every spur search as an exact A*
+heuristic for the unmasked graph, and a spur search stops as soon as it
+settles a vertex whose path in the tree avoids everything masked, since no
+detour can be shorter than following the tree from there.
+
+Typical usage example:
+    for path in k_shortest_paths(graph, v_a, v_e, k=3):
+        print(f'{path.distance}: {path}')
+"""
+from __future__ import annotations
+from collections.abc import Iterator
+from heapq import heappop, heappush
+from itertools import count
+from algorithms import dijkstra_distances
+from data_structures import Graph, SearchSpace, ShortestPath, Vertex
+
+
+def k_shortest_paths(graph: Graph, start: Vertex, destination: Vertex, k: int) -> Iterator[ShortestPath]:
+    """Yields up to k loopless paths from start to destination in order of cost.
+
+    Args:
+        graph: A graph with edges and vertices.
+        start: The start vertex.
+        destination: The destination vertex.
+        k: The maximum number of paths to yield.
+    """
+    reverse_adjacency = [[] for _ in graph.adjacency]
+    for vertex_id, edges in enumerate(graph.adjacency):
+        for neighbor, cost in edges:
+            reverse_adjacency[neighbor].append((vertex_id, cost))
+
+    tree = dijkstra_distances(reverse_adjacency, graph.ids[destination])
+    start_id = graph.ids[start]
+    if tree.cost(start_id) == float('inf'): return
+    path = ShortestPath.from_vertex_ids(graph, _tree_path(tree, start_id), tree.cost(start_id))
+
+    blocked_vertices = [False] * len(graph.names)
+    roots = {}
+    candidates = []
+    seen = {path.vertex_ids}
+    tie_breaker = count()
+    deviation = 0
+
+    for _ in range(k):
+        yield path
+
+        vertex_ids = path.vertex_ids
+        prefix_costs = [0]
+        for edge in path.edges:
+            prefix_costs.append(prefix_costs[-1] + edge.cost)
+
+        # Add the path to the trie of roots, remembering the node of each prefix
+        node = roots
+        prefix_nodes = []
+        for vertex_id in vertex_ids:
+            node = node.setdefault(vertex_id, {})
+            prefix_nodes.append(node)
+
+        for vertex_id in vertex_ids[:deviation]:
+            blocked_vertices[vertex_id] = True
+
+        for i in range(deviation, len(vertex_ids) - 1):
+            spur = vertex_ids[i]
+            spur_path = _spur_path(graph, tree, spur, blocked_vertices, prefix_nodes[i])
+            blocked_vertices[spur] = True
+
+            if spur_path is None: continue
+            spur_distance, spur_ids = spur_path
+            candidate = vertex_ids[:i] + spur_ids
+
+            if candidate not in seen:
+                seen.add(candidate)
+                heappush(candidates, (prefix_costs[i] + spur_distance, next(tie_breaker), candidate, i))
+
+        for vertex_id in vertex_ids:
+            blocked_vertices[vertex_id] = False
+
+        if not candidates: return
+        distance, _, vertex_ids, deviation = heappop(candidates)
+        path = ShortestPath.from_vertex_ids(graph, vertex_ids, distance)
+
+
+def _tree_path(tree: SearchSpace, vertex_id: int) -> tuple[int, ...]:
+    """Returns the vertex ids from a vertex to the destination along the reversed shortest path tree."""
+    vertex_ids = []
+
+    while vertex_id != -1:
+        vertex_ids.append(vertex_id)
+        vertex_id = tree.came_from[vertex_id]
+
+    return tuple(vertex_ids)
+
+
+def _spur_path(
+    graph: Graph,
+    tree: SearchSpace,
+    spur: int,
+    blocked_vertices: list[bool],
+    blocked_edges: dict[int, dict],
+) -> tuple[int, tuple[int, ...]] | None:
+    """A* search for the shortest detour from a spur vertex to the destination.
+
+    Args:
+        graph: A graph with edges and vertices.
+        tree: The reversed shortest path tree of the destination.
+        spur: The id of the spur vertex.
+        blocked_vertices: Flags indexed by id of vertices the detour must not visit.
+        blocked_edges: The ids of the vertices that must not be reached directly from the spur vertex.
+
+    Returns:
+        The distance and vertex ids of the detour, or None if there is none.
+    """
+    adjacency = graph.adjacency
+    clear = {}
+    heap = [(tree.cost(spur), 0, spur)]
+
+    with graph.search_space(spur) as space:
+        costs = space.costs
+        came_from = space.came_from
+        reached = space.reached
+        visited = space.settled
+        version = space.version
+
+        while heap:
+            _, cost, current = heappop(heap)
+            cost = -cost
+            if visited[current] == version: continue
+            visited[current] = version
+
+            # Follow the tree until a masked vertex or edge, or a vertex known to be clear or not
+            walked = []
+            vertex_id = current
+            while vertex_id != -1 and vertex_id not in clear:
+                following = tree.came_from[vertex_id]
+                walked.append(vertex_id)
+                if following != -1 and (
+                        blocked_vertices[following] or vertex_id == spur and following in blocked_edges):
+                    clear[vertex_id] = False
+                    break
+                vertex_id = following
+
+            is_clear = vertex_id == -1 or clear[vertex_id]
+            for vertex_id in walked:
+                clear[vertex_id] = is_clear
+
+            if is_clear:
+                return cost + tree.cost(current), space.path_to(current)[:-1] + _tree_path(tree, current)
+
+            for neighbor, edge_cost in adjacency[current]:
+                if visited[neighbor] == version or blocked_vertices[neighbor]: continue
+                if current == spur and neighbor in blocked_edges: continue
+                remaining = tree.cost(neighbor)
+                new_cost = cost + edge_cost
+
+                if remaining != float('inf') and (reached[neighbor] != version or new_cost < costs[neighbor]):
+                    reached[neighbor] = version
+                    came_from[neighbor] = current
+                    costs[neighbor] = new_cost
+                    heappush(heap, (new_cost + remaining, -new_cost, neighbor))
+
+    return None
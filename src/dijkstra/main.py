@@ -24,18 +24,24 @@ Typical usage example:
 
     print("\nDijkstra Lazy Version:")
     print("-" * 31)
-    dijkstra_lazy(graph, v_a, v_e)
-
-    # Reset visited vertices
-    for vertex in graph.vertices:
-        vertex.visited = False
+    path = dijkstra_lazy(graph, v_a, v_e)
+    print(f'Distance: {path.distance}')
+    print(f'Shortest Path: {path}')
 
     print("\nDijkstra Eager Version:")
     print("-" * 31)
-    dijkstra_eager(graph, v_a, v_e)
+    path = dijkstra_eager(graph, v_a, v_e)
+    print(f'Distance: {path.distance}')
+    print(f'Shortest Path: {path}')
+
+    print("\nK Shortest Paths:")
+    print("-" * 31)
+    for path in k_shortest_paths(graph, v_a, v_e, 3):
+        print(f'{path.distance}: {path}')
 """
 from algorithms import dijkstra_eager, dijkstra_lazy
 from data_structures import Edge, Graph, Vertex
+from k_shortest import k_shortest_paths
 
 if __name__ == '__main__':
     v_a = Vertex('A')
@@ -61,12 +67,17 @@ if __name__ == '__main__':
 
     print("\nDijkstra Lazy Version:")
     print("-" * 31)
-    dijkstra_lazy(graph, v_a, v_e)
-
-    # Reset visited vertices
-    for vertex in graph.vertices:
-        vertex.visited = False
+    path = dijkstra_lazy(graph, v_a, v_e)
+    print(f'Distance: {path.distance}')
+    print(f'Shortest Path: {path}')
 
     print("\nDijkstra Eager Version:")
     print("-" * 31)
-    dijkstra_eager(graph, v_a, v_e)
+    path = dijkstra_eager(graph, v_a, v_e)
+    print(f'Distance: {path.distance}')
+    print(f'Shortest Path: {path}')
+
+    print("\nK Shortest Paths:")
+    print("-" * 31)
+    for path in k_shortest_paths(graph, v_a, v_e, 3):
+        print(f'{path.distance}: {path}')
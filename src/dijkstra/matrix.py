@@ -0,0 +1,157 @@
+"""Computes many-to-many distance tables.
+
+Rather than running one point-to-point query for every (source, target) pair,
+the distance matrix runs a single one-to-many search per source which stops
+as soon as all targets are settled. Each search fills one row of the matrix.
+
+The matrix is stored row-major as 64-bit floats, unreachable targets are
+infinity. Rows are written straight into a preallocated buffer: an array,
+any writable buffer passed by the caller (e.g. a NumPy float64 array), or a
+memory-mapped file for matrices that don't fit into memory.
+
+Without sources or targets, no search is run and the matrix is an empty view
+of the requested shape.
+
+Typical usage example:
+    matrix = distance_matrix(graph, sources, targets)
+    print(matrix[0, 1])
+
+    matrix = distance_matrix(graph, sources, targets, processes=8, path='distances.bin')
+"""
+from __future__ import annotations
+import ctypes
+import mmap
+import os
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from algorithms import dijkstra_distances
+from data_structures import Graph, SearchSpace, Vertex
+
+_worker_adjacency = None
+_worker_targets = None
+_worker_space = None
+
+
+def distance_matrix(
+    graph: Graph,
+    sources: Sequence[Vertex],
+    targets: Sequence[Vertex],
+    processes: int | None = None,
+    out: object | None = None,
+    path: str | None = None,
+) -> memoryview:
+    """Computes the distances from every source to every target.
+
+    Args:
+        graph: A graph with edges and vertices.
+        sources: The vertices the rows belong to.
+        targets: The vertices the columns belong to.
+        processes: Number of worker processes to spread the sources over.
+            If None, all searches run in the calling process.
+        out: A writable, C-contiguous buffer of len(sources) * len(targets)
+            doubles the matrix is written into.
+        path: A file the matrix is streamed into through a memory map.
+            The file is created or truncated to the size of the matrix.
+
+    Returns:
+        A memoryview of shape (len(sources), len(targets)) over the matrix.
+
+    Raises:
+        ValueError: If both out and path are given, or out has the wrong size.
+    """
+    rows = len(sources)
+    cols = len(targets)
+    source_ids = [graph.ids[vertex] for vertex in sources]
+    target_ids = [graph.ids[vertex] for vertex in targets]
+
+    if out is not None and path is not None:
+        raise ValueError('Pass either out or path, not both.')
+
+    if path is not None:
+        out = _map_file(path, rows * cols)
+    elif out is None:
+        out = array('d', bytes(8 * rows * cols))
+
+    matrix = memoryview(out).cast('B').cast('d')
+
+    if len(matrix) != rows * cols:
+        raise ValueError(f'Expected a buffer of {rows * cols} doubles, got {len(matrix)}.')
+
+    if not rows or not cols:
+        return _empty_matrix(rows, cols)
+
+    if processes is None or processes <= 1 or rows <= 1:
+        space = SearchSpace(len(graph.adjacency))
+        for i, source in enumerate(source_ids):
+            matrix[i * cols:(i + 1) * cols] = _distance_row(graph.adjacency, source, target_ids, space)
+    else:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(graph.adjacency, target_ids)) as pool:
+            chunksize = max(1, rows // (4 * processes))
+            for i, row in enumerate(pool.map(_worker_distance_row, source_ids, chunksize=chunksize)):
+                matrix[i * cols:(i + 1) * cols] = row
+
+    if isinstance(out, mmap.mmap):
+        out.flush()
+
+    return matrix.cast('B').cast('d', shape=[rows, cols])
+
+
+def load_distance_matrix(path: str, cols: int) -> memoryview:
+    """Memory-maps a distance matrix previously written by distance_matrix.
+
+    Args:
+        path: The file the matrix was written to.
+        cols: The number of targets of the matrix.
+
+    Returns:
+        A read-only memoryview of shape (rows, cols) over the file.
+    """
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if not size or not cols:
+            return _empty_matrix(size // (8 * cols) if cols else 0, cols)
+
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    rows = len(buffer) // (8 * cols)
+    return memoryview(buffer).cast('d', shape=[rows, cols])
+
+
+def _distance_row(
+    adjacency: list[list[tuple[int, int]]],
+    source: int,
+    target_ids: list[int],
+    space: SearchSpace,
+) -> array:
+    """Computes one row of the distance matrix."""
+    space = dijkstra_distances(adjacency, source, target_ids, space)
+    return array('d', [space.cost(target) for target in target_ids])
+
+
+def _map_file(path: str, size: int) -> mmap.mmap | bytearray:
+    """Creates a file of size doubles and maps it into memory.
+
+    Empty files can't be mapped, so an empty buffer is returned for them instead.
+    """
+    with open(path, 'w+b') as file:
+        file.truncate(8 * size)
+        return mmap.mmap(file.fileno(), 8 * size) if size else bytearray()
+
+
+def _empty_matrix(rows: int, cols: int) -> memoryview:
+    """Returns an empty view of shape (rows, cols), which memoryview.cast can't create."""
+    return memoryview((ctypes.c_double * cols * rows)())
+
+
+def _init_worker(adjacency: list[list[tuple[int, int]]], target_ids: list[int]) -> None:
+    """Stores the graph, targets and a search space once per worker process."""
+    global _worker_adjacency, _worker_targets, _worker_space
+    _worker_adjacency = adjacency
+    _worker_targets = target_ids
+    _worker_space = SearchSpace(len(adjacency))
+
+
+def _worker_distance_row(source: int) -> array:
+    """Computes one row of the distance matrix inside a worker process."""
+    return _distance_row(_worker_adjacency, source, _worker_targets, _worker_space)
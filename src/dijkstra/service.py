@@ -0,0 +1,302 @@
+"""Serves shortest path queries over a graph which is loaded once.
+
+The service speaks a JSON-lines protocol over TCP. Every request is one JSON
+object per line and is answered by one JSON object per line with the same id:
+    {"id": 1, "source": "A", "destination": "E"}
+    -> {"id": 1, "distance": 20, "path": ["A", "C", "F", "E"]}
+
+    {"id": 2, "op": "stats"}
+    -> {"id": 2, "queries": 1, "searches": 1, ...}
+
+Searches are CPU-bound, so they run on a process pool and never block the
+event loop. Identical (source, destination) queries which are in flight are
+coalesced and share one result. Queries which arrive within a short batch
+window and share a source are answered by a single one-to-many search.
+
+Typical usage example:
+    service = QueryService(graph)
+    asyncio.run(service.serve('127.0.0.1', 8765))
+
+    client = await QueryClient.connect('127.0.0.1', 8765)
+    distance, path = await client.query('A', 'E')
+"""
+from __future__ import annotations
+import asyncio
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from time import perf_counter
+from algorithms import dijkstra_distances
+from data_structures import Graph, SearchSpace
+
+_worker_adjacency = None
+_worker_space = None
+
+
+class QueryService:
+    """Class which answers shortest path queries over a loaded graph.
+
+    Attributes:
+        graph: The graph queries are answered on.
+        batch_delay: Seconds queries wait for others sharing their source.
+        _ids: Maps vertex names to vertex ids.
+        _pool: The process pool the searches run on.
+        _in_flight: Pending results by (source, destination) id pair.
+        _batches: Pending destinations by source id, waiting to be searched.
+        _tasks: Running batch searches.
+        _latencies: Latencies of the most recent queries in seconds.
+        _counters: Query, coalescing and search counters.
+        _started: Time the service was created.
+    """
+
+    def __init__(self, graph: Graph, workers: int | None = None, batch_delay: float = 0.002) -> None:
+        """Initializes the query service.
+
+        Args:
+            graph: The graph queries are answered on.
+            workers: Number of worker processes, defaults to the number of CPUs.
+            batch_delay: Seconds queries wait for others sharing their source.
+        """
+        self.graph = graph
+        self.batch_delay = batch_delay
+        self._ids = {name: vertex_id for vertex_id, name in enumerate(graph.names)}
+        self._pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(graph.adjacency,))
+        self._in_flight = {}
+        self._batches = {}
+        self._tasks = set()
+        self._latencies = deque(maxlen=10_000)
+        self._counters = dict.fromkeys(('queries', 'coalesced', 'searches', 'errors'), 0)
+        self._started = perf_counter()
+
+    async def query(self, source: str, destination: str) -> tuple[float, list[str]]:
+        """Answers a single query.
+
+        Returns:
+            The distance and the vertex names of the shortest path. If there
+            is no path, the distance is infinity and the path is empty.
+
+        Raises:
+            TypeError: If source or destination is not a vertex name.
+            KeyError: If source or destination is not part of the graph.
+        """
+        started = perf_counter()
+        self._counters['queries'] += 1
+
+        if not isinstance(source, str) or not isinstance(destination, str):
+            raise TypeError('Source and destination must be vertex names.')
+
+        key = (self._ids[source], self._ids[destination])
+        future = self._in_flight.get(key)
+
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._in_flight[key] = future
+            self._enqueue(*key, future)
+        else:
+            self._counters['coalesced'] += 1
+
+        # Shielded, so a cancelled caller doesn't cancel the answer of coalesced ones
+        distance, vertex_ids = await asyncio.shield(future)
+        self._latencies.append(perf_counter() - started)
+        return distance, [self.graph.names[vertex_id] for vertex_id in vertex_ids]
+
+    def stats(self) -> dict[str, float]:
+        """Returns latency and throughput statistics."""
+        latencies = sorted(self._latencies)
+        uptime = perf_counter() - self._started
+        stats = dict(self._counters)
+        stats['uptime'] = uptime
+        stats['throughput'] = self._counters['queries'] / uptime if uptime else 0.0
+
+        if latencies:
+            stats['latency_mean'] = sum(latencies) / len(latencies)
+            stats['latency_p50'] = latencies[len(latencies) // 2]
+            stats['latency_p99'] = latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]
+
+        return stats
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765) -> None:
+        """Serves queries until the task is cancelled."""
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765) -> asyncio.Server:
+        """Starts serving queries in the background.
+
+        Returns:
+            The server, which tells the port it listens on if port was 0.
+        """
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    def close(self) -> None:
+        """Shuts down the worker processes."""
+        self._pool.shutdown(cancel_futures=True)
+
+    def _enqueue(self, source: int, destination: int, future: asyncio.Future) -> None:
+        """Adds a query to the batch of its source, starting the batch if needed."""
+        batch = self._batches.get(source)
+
+        if batch is None:
+            batch = self._batches[source] = {}
+            asyncio.get_running_loop().call_later(self.batch_delay, self._start_batch, source)
+
+        batch[destination] = future
+
+    def _start_batch(self, source: int) -> None:
+        """Starts the search of a batch once its window has passed."""
+        task = asyncio.create_task(self._run_batch(source))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, source: int) -> None:
+        """Runs one search for all queued destinations of a source."""
+        batch = self._batches.pop(source)
+        destinations = list(batch)
+        self._counters['searches'] += 1
+
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _worker_paths, source, destinations)
+        except Exception as error:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for destination, result in zip(destinations, results):
+                if not batch[destination].done():
+                    batch[destination].set_result(result)
+        finally:
+            for destination in destinations:
+                del self._in_flight[(source, destination)]
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers the requests of one client, concurrently and possibly out of order."""
+        tasks = set()
+
+        while line := await reader.readline():
+            task = asyncio.create_task(self._handle_request(line, writer))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.wait(tasks)
+
+        writer.close()
+
+    async def _handle_request(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        """Answers a single JSON request.
+
+        Every request gets a response, failures of any kind are reported as an error.
+        """
+        response = {'id': None}
+
+        try:
+            request = json.loads(line)
+            response['id'] = request.get('id')
+
+            if request.get('op') == 'stats':
+                response.update(self.stats())
+            else:
+                distance, path = await self.query(request['source'], request['destination'])
+                response['distance'] = distance if path else None
+                response['path'] = path
+        except Exception as error:
+            self._counters['errors'] += 1
+            response['error'] = f'{type(error).__name__}: {error}'
+
+        writer.write(json.dumps(response).encode() + b'\n')
+        await writer.drain()
+
+
+class QueryClient:
+    """Class which sends queries to a running QueryService.
+
+    Attributes:
+        _reader: The stream responses are read from.
+        _writer: The stream requests are written to.
+        _pending: Futures waiting for a response, by request id.
+        _ids: Generator of request ids.
+        _receiver: The task dispatching responses to the pending futures.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Initializes the client on an open connection."""
+        self._reader = reader
+        self._writer = writer
+        self._pending = {}
+        self._ids = count()
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765) -> QueryClient:
+        """Connects to a query service."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def query(self, source: str, destination: str) -> tuple[float | None, list[str]]:
+        """Returns the distance and vertex names of the shortest path.
+
+        Raises:
+            LookupError: If the service could not answer the query.
+            ConnectionError: If the connection was closed before the answer arrived.
+        """
+        response = await self._request({'source': source, 'destination': destination})
+        return response['distance'], response['path']
+
+    async def stats(self) -> dict[str, float]:
+        """Returns the statistics of the service."""
+        response = await self._request({'op': 'stats'})
+        del response['id']
+        return response
+
+    async def close(self) -> None:
+        """Closes the connection."""
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+
+    async def _request(self, request: dict) -> dict:
+        """Sends a request and waits for its response."""
+        request['id'] = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request['id']] = future
+        self._writer.write(json.dumps(request).encode() + b'\n')
+        await self._writer.drain()
+        response = await future
+
+        if 'error' in response:
+            raise LookupError(response['error'])
+
+        return response
+
+    async def _receive(self) -> None:
+        """Dispatches responses to the futures waiting for them."""
+        while line := await self._reader.readline():
+            response = json.loads(line)
+            self._pending.pop(response['id']).set_result(response)
+
+        for future in self._pending.values():
+            future.set_exception(ConnectionError('The service closed the connection.'))
+        self._pending.clear()
+
+
+def _init_worker(adjacency: list[list[tuple[int, int]]]) -> None:
+    """Stores the graph and a search space once per worker process."""
+    global _worker_adjacency, _worker_space
+    _worker_adjacency = adjacency
+    _worker_space = SearchSpace(len(adjacency))
+
+
+def _worker_paths(source: int, destinations: list[int]) -> list[tuple[float, list[int]]]:
+    """Computes the distances and paths from a source to all destinations."""
+    space = dijkstra_distances(_worker_adjacency, source, destinations, _worker_space)
+    results = []
+
+    for destination in destinations:
+        cost = space.cost(destination)
+        vertex_ids = list(space.path_to(destination)) if cost != float('inf') else []
+        results.append((cost, vertex_ids))
+
+    return results
@@ -0,0 +1,185 @@
+"""Replays pathfinding scenarios without a window to compare the algorithms.
+
+The same pathfinders the visualizer animates are run to completion on a grid
+built from a map, once per scenario and algorithm. For every run the path cost,
+the number of expanded vertices and the elapsed time are recorded, as well as
+whether a memory-bounded algorithm gave up rather than proved there is no path.
+Only the vertices a run touched are reset afterwards, so replaying many short
+scenarios on a large map stays cheap.
+
+Hierarchical pathfinding (HPA*) can be added to the comparison. It answers
+the same scenarios on a cluster graph built once for the map, and doesn't
+report expanded vertices. Its paths are not always the shortest ones, which
+shows in the number of worse paths.
+
+Typical usage example:
+    python benchmark.py arena.map arena.map.scen --limit 1000
+    python benchmark.py arena.map arena.map.scen --algorithms A_STAR_SEARCH --hpa 16
+    python benchmark.py grid.pfg
+"""
+from __future__ import annotations
+import argparse
+from time import perf_counter
+from typing import NamedTuple
+import numpy as np
+from grid_io import load_grid, load_map, load_scenarios
+from hpa import ClusterGraph
+from pathfinder import Pathfinder
+from vertex import Vertex, lazy_grid
+from utils import Algorithms, States
+
+# Algorithms which may take seconds per scenario on large maps before they find a path or give up
+_MEMORY_BOUNDED = (Algorithms.IDA_STAR_SEARCH, Algorithms.SMA_STAR_SEARCH)
+
+# Name of hierarchical pathfinding in the results, which isn't one of the visualized algorithms
+HPA_STAR_SEARCH = 'HPA_STAR_SEARCH'
+
+
+class Result(NamedTuple):
+    """The outcome of running one algorithm on one scenario."""
+    algorithm: Algorithms | str
+    cost: int | None
+    expanded: int
+    seconds: float
+    gave_up: bool = False
+
+
+def build_grid(walls: np.ndarray) -> list[list[Vertex]]:
+    """Builds a grid of vertices from a wall array."""
+    rows, cols = walls.shape
+    states = bytearray(np.where(walls, States.WALL, States.EMPTY).astype(np.uint8).tobytes())
+    return lazy_grid(states, rows, cols)
+
+
+def run_scenario(
+    grid: list[list[Vertex]],
+    start: tuple[int, int],
+    destination: tuple[int, int],
+    algorithm: Algorithms,
+) -> Result:
+    """Runs an algorithm from start to destination and resets the grid afterwards."""
+    start_vertex = grid[start[0]][start[1]]
+    destination_vertex = grid[destination[0]][destination[1]]
+    start_vertex.make_start()
+    destination_vertex.make_destination()
+
+    touched = []
+    steps = Pathfinder.run(algorithm, grid, start_vertex, destination_vertex)
+    started = perf_counter()
+
+    try:
+        while True:
+            touched.append(next(steps)[0])
+    except StopIteration as stop:
+        found = stop.value
+
+    seconds = perf_counter() - started
+    touched = set(touched)
+    touched.discard(start_vertex)
+    touched.discard(destination_vertex)
+
+    if not found:
+        cost = None
+    elif start == destination:
+        cost = 0
+    else:
+        cost = sum(vertex.is_path() for vertex in touched) + 1
+
+    for vertex in touched:
+        vertex.reset_vertex()
+    start_vertex.reset_vertex()
+    destination_vertex.reset_vertex()
+
+    return Result(algorithm, cost, len(touched), seconds, found is None)
+
+
+def run_benchmark(
+    walls: np.ndarray,
+    problems: list[tuple[tuple[int, int], tuple[int, int]]],
+    algorithms: list[Algorithms],
+) -> list[list[Result]]:
+    """Runs every algorithm on every problem.
+
+    Returns:
+        For every problem, the results of all algorithms in the given order.
+    """
+    grid = build_grid(walls)
+    return [[run_scenario(grid, start, destination, algorithm) for algorithm in algorithms]
+            for start, destination in problems]
+
+
+def run_hpa(
+    walls: np.ndarray,
+    problems: list[tuple[tuple[int, int], tuple[int, int]]],
+    cluster_size: int,
+) -> tuple[float, list[Result]]:
+    """Answers every problem with HPA* on one cluster graph.
+
+    Returns:
+        The seconds spent building the cluster graph and the result of every problem.
+    """
+    started = perf_counter()
+    clusters = ClusterGraph(walls, cluster_size)
+    build_seconds = perf_counter() - started
+    results = []
+
+    for start, destination in problems:
+        started = perf_counter()
+        path = clusters.find_path(start, destination)
+        seconds = perf_counter() - started
+        results.append(Result(HPA_STAR_SEARCH, len(path) - 1 if path else None, 0, seconds))
+
+    return build_seconds, results
+
+
+def print_summary(results: list[list[Result]], algorithms: list[Algorithms | str]) -> None:
+    """Prints the totals of every algorithm, comparing costs to the first algorithm."""
+    print(f'{"Algorithm":<22}{"Solved":>8}{"Gave up":>8}{"Worse":>8}{"Mean cost":>12}{"Expanded":>12}'
+          f'{"Seconds":>10}')
+
+    for i, algorithm in enumerate(algorithms):
+        runs = [problem[i] for problem in results]
+        costs = [run.cost for run in runs if run.cost is not None]
+        gave_up = sum(run.gave_up for run in runs)
+        worse = sum(problem[i].cost != problem[0].cost and not problem[i].gave_up for problem in results)
+        mean_cost = sum(costs) / len(costs) if costs else float('nan')
+        expanded = sum(run.expanded for run in runs)
+        seconds = sum(run.seconds for run in runs)
+        name = getattr(algorithm, 'name', algorithm)
+        print(f'{name:<22}{len(costs):>8}{gave_up:>8}{worse:>8}{mean_cost:>12.2f}{expanded:>12}{seconds:>10.3f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('map', help='a MovingAI .map file or a grid file')
+    parser.add_argument('scenarios', nargs='?', help='a MovingAI .scen file, required for .map files')
+    parser.add_argument('--limit', type=int, help='maximum number of scenarios to run')
+    parser.add_argument(
+        '--algorithms',
+        nargs='+',
+        choices=[algorithm.name for algorithm in Algorithms],
+        default=[algorithm.name for algorithm in Algorithms if algorithm not in _MEMORY_BOUNDED],
+        help='the memory-bounded IDA* and SMA* searches are slow on large maps, so they only run if listed',
+    )
+    parser.add_argument('--hpa', type=int, metavar='CLUSTER_SIZE', help='also run HPA* with clusters of this size')
+    args = parser.parse_args()
+
+    if args.map.endswith('.map'):
+        walls = load_map(args.map)
+        problems = [(scenario.start, scenario.destination) for scenario in load_scenarios(args.scenarios)]
+    else:
+        grid_file = load_grid(args.map)
+        walls = grid_file.walls
+        problems = [(grid_file.start, grid_file.destination)]
+
+    problems = problems[:args.limit]
+    algorithms = [Algorithms[name] for name in args.algorithms]
+    results = run_benchmark(walls, problems, algorithms)
+
+    if args.hpa:
+        build_seconds, hpa_results = run_hpa(walls, problems, args.hpa)
+        results = [problem + [hpa_result] for problem, hpa_result in zip(results, hpa_results)]
+        algorithms.append(HPA_STAR_SEARCH)
+        print(f'Built the HPA* cluster graph in {build_seconds:.3f} seconds')
+
+    print_summary(results, algorithms)
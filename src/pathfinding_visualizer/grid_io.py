@@ -0,0 +1,223 @@
+"""Saves and loads grids and benchmark scenarios.
+
+Grids are stored in a compact binary format:
+- A little-endian header with a magic number, version, flags, the size of
+  the grid, and the start and destination positions (-1 if not set).
+- The walls, packed into bits in row-major order.
+- Optionally the weight of every vertex as one byte each, row-major.
+
+Since walls and weights are stored at fixed offsets, large grids can be
+memory-mapped instead of read, and single vertices looked up without
+unpacking the whole grid.
+
+Additionally, the map and scenario files of the MovingAI pathfinding benchmarks
+(https://movingai.com/benchmarks/formats.html) are supported. MovingAI maps are
+indexed by (x, y), which corresponds to (row, col) of the visualizer's grid.
+
+Typical usage example:
+    save_grid('grid.pfg', walls, start=(0, 0), destination=(49, 49))
+    grid_file = load_grid('grid.pfg', memory_map=True)
+
+    walls = load_map('arena.map')
+    scenarios = load_scenarios('arena.map.scen')
+"""
+from __future__ import annotations
+import struct
+from typing import NamedTuple
+import numpy as np
+
+_MAGIC = b'PFVG'
+_VERSION = 1
+_HAS_WEIGHTS = 1
+_HEADER = struct.Struct('<4sHHIIiiii')
+
+# Terrain of MovingAI maps which can be traversed on foot
+_PASSABLE = b'.GS'
+
+
+class GridFile:
+    """Class which represents a grid loaded from a file.
+
+    Attributes:
+        rows: The number of rows of the grid.
+        cols: The number of columns of the grid.
+        start: Position of the start vertex, or None.
+        destination: Position of the destination vertex, or None.
+        packed_walls: The walls packed into bits, possibly memory-mapped.
+        weights: The weights of the vertices, possibly memory-mapped, or None.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        start: tuple[int, int] | None,
+        destination: tuple[int, int] | None,
+        packed_walls: np.ndarray,
+        weights: np.ndarray | None,
+    ) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.start = start
+        self.destination = destination
+        self.packed_walls = packed_walls
+        self.weights = weights
+
+    @property
+    def walls(self) -> np.ndarray:
+        """Unpacks the walls into a boolean array of shape (rows, cols)."""
+        walls = np.unpackbits(self.packed_walls, count=self.rows * self.cols)
+        return walls.reshape(self.rows, self.cols).view(bool)
+
+    def is_wall(self, row: int, col: int) -> bool:
+        """Checks if a vertex is a wall without unpacking the grid."""
+        index = row * self.cols + col
+        return bool(self.packed_walls[index >> 3] & (0x80 >> (index & 7)))
+
+
+class Scenario(NamedTuple):
+    """A single MovingAI benchmark problem."""
+    bucket: int
+    map_name: str
+    width: int
+    height: int
+    start: tuple[int, int]
+    destination: tuple[int, int]
+    optimal_length: float
+
+
+def save_grid(
+    path: str,
+    walls: np.ndarray,
+    start: tuple[int, int] | None = None,
+    destination: tuple[int, int] | None = None,
+    weights: np.ndarray | None = None,
+) -> None:
+    """Saves a grid in the binary grid format.
+
+    Args:
+        path: The file to write.
+        walls: A boolean array of shape (rows, cols) which is True for walls.
+        start: Position of the start vertex.
+        destination: Position of the destination vertex.
+        weights: An array of shape (rows, cols) of weights between 0 and 255.
+    """
+    rows, cols = walls.shape
+    start_row, start_col = start if start else (-1, -1)
+    destination_row, destination_col = destination if destination else (-1, -1)
+    flags = _HAS_WEIGHTS if weights is not None else 0
+
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(
+            _MAGIC, _VERSION, flags, rows, cols, start_row, start_col, destination_row, destination_col))
+        file.write(np.packbits(walls.astype(bool), axis=None).tobytes())
+
+        if weights is not None:
+            file.write(np.asarray(weights, dtype=np.uint8).tobytes())
+
+
+def load_grid(path: str, memory_map: bool = False) -> GridFile:
+    """Loads a grid saved in the binary grid format.
+
+    Args:
+        path: The file to read.
+        memory_map: Map walls and weights into memory instead of reading them.
+
+    Raises:
+        ValueError: If the file is not a grid file of a supported version.
+    """
+    with open(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+
+    if len(header) < _HEADER.size or header[:4] != _MAGIC:
+        raise ValueError(f'{path} is not a grid file.')
+
+    _, version, flags, rows, cols, start_row, start_col, destination_row, destination_col = _HEADER.unpack(header)
+
+    if version != _VERSION:
+        raise ValueError(f'{path} has unsupported grid file version {version}.')
+
+    packed_size = (rows * cols + 7) // 8
+    weights_offset = _HEADER.size + packed_size
+
+    if memory_map:
+        packed_walls = np.memmap(path, np.uint8, 'r', _HEADER.size, (packed_size,))
+        weights = np.memmap(path, np.uint8, 'r', weights_offset, (rows, cols)) if flags & _HAS_WEIGHTS else None
+    else:
+        data = np.fromfile(path, np.uint8, offset=_HEADER.size)
+        packed_walls = data[:packed_size]
+        weights = data[packed_size:].reshape(rows, cols) if flags & _HAS_WEIGHTS else None
+
+    start = (start_row, start_col) if start_row >= 0 else None
+    destination = (destination_row, destination_col) if destination_row >= 0 else None
+    return GridFile(rows, cols, start, destination, packed_walls, weights)
+
+
+def load_map(path: str) -> np.ndarray:
+    """Loads a MovingAI map as a boolean wall array of shape (width, height).
+
+    Raises:
+        ValueError: If the file is not an octile MovingAI map.
+    """
+    with open(path, 'rb') as file:
+        lines = file.read().splitlines()
+
+    header = dict(line.decode().split(maxsplit=1) for line in lines[:3])
+    if lines[3].strip() != b'map' or header.get('type') != 'octile':
+        raise ValueError(f'{path} is not a MovingAI map.')
+
+    height = int(header['height'])
+    width = int(header['width'])
+    terrain = np.frombuffer(b''.join(line[:width] for line in lines[4:4 + height]), np.uint8)
+    walls = ~np.isin(terrain, np.frombuffer(_PASSABLE, np.uint8))
+    return walls.reshape(height, width).T.copy()
+
+
+def save_map(path: str, walls: np.ndarray) -> None:
+    """Saves a boolean wall array of shape (width, height) as a MovingAI map."""
+    width, height = walls.shape
+    terrain = np.where(walls.T, ord('@'), ord('.')).astype(np.uint8)
+
+    with open(path, 'wb') as file:
+        file.write(f'type octile\nheight {height}\nwidth {width}\nmap\n'.encode())
+        file.write(b'\n'.join(row.tobytes() for row in terrain) + b'\n')
+
+
+def load_scenarios(path: str) -> list[Scenario]:
+    """Loads the problems of a MovingAI scenario file."""
+    scenarios = []
+
+    with open(path) as file:
+        for line in file:
+            fields = line.split('\t') if '\t' in line else line.split()
+            if len(fields) < 9: continue
+
+            bucket, map_name, width, height, start_x, start_y, goal_x, goal_y, optimal = fields[:9]
+            scenarios.append(Scenario(
+                int(bucket),
+                map_name,
+                int(width),
+                int(height),
+                (int(start_x), int(start_y)),
+                (int(goal_x), int(goal_y)),
+                float(optimal),
+            ))
+
+    return scenarios
+
+
+def save_scenarios(path: str, scenarios: list[Scenario]) -> None:
+    """Saves problems as a MovingAI scenario file."""
+    with open(path, 'w') as file:
+        file.write('version 1\n')
+
+        for scenario in scenarios:
+            file.write('\t'.join(map(str, (
+                scenario.bucket,
+                scenario.map_name,
+                scenario.width,
+                scenario.height,
+                *scenario.start,
+                *scenario.destination,
+                scenario.optimal_length,
+            ))) + '\n')
@@ -4,94 +4,307 @@ The GUI handles mouse and keyboard events such as:
 - Left click to create the start, destination and walls
 - Right click to undo a vertex
 - Press c to reset all vertices
-- Press m to generate a random maze
+- Press m to generate a maze, pressing it again cycles through the maze types
+- Press s to save the grid, press l to load it again
+- Press n to load the start and destination of the next scenario
+- Press h to show or hide the cluster graph of hierarchical pathfinding (HPA*)
+- Scroll the mouse wheel to zoom, use the arrow keys to move the view
+- Press f to fit the grid into the window
 - Press 1 to visualize Dijkstra's algorithm
 - Press 2 to visualize A* search
 - Press 3 to visualize Bidirectional search
 - Press 4 to visualize Breadth-first search
 - Press 5 to visualize Depth-first search
+- Press 6 to visualize IDA* search
+- Press 7 to visualize SMA* search
+- Press r to race Dijkstra, A*, Bidirectional and Breadth-first search side by
+  side, press t to switch between lockstep and equal time, esc to return
+
+The grid can be larger than the window and doesn't have to be square. Only the
+vertices inside the view are drawn. When zoomed out so far that several vertices
+share a pixel, they are aggregated, showing the most important state among them.
 """
+import os
+from math import ceil
 import pygame
-from random import randrange
+import numpy as np
+from grid_io import Scenario, load_grid, load_map, load_scenarios, save_grid
+from hpa import ClusterGraph
+from maze import generate_maze
 from pathfinder import Pathfinder
-from vertex import Vertex
-from utils import Algorithms, Colors
+from race import Race
+from render import render_states
+from vertex import Vertex, lazy_grid
+from utils import Algorithms, Colors, Mazes, States
+
+# Zoom levels in pixels per vertex
+_MAX_ZOOM = 64
+_GRID_LINES_ZOOM = 4
 
 
 class GUI:
     """Class which implements the user interface.
 
     Attributes:
-        _pathfinder: The pathfinder object used to run the algorithms.
-        _gap: The width of a vertex.
         _rows: The number of rows of the grid.
         _cols: The number of columns of the grid.
         _width: The width of the interface.
+        _height: The height of the interface.
         _window: The graphical user interface.
+        _states: The states of all vertices, shared with the vertices.
+        _state_array: A (rows, cols) array view of the states.
+        _touched: The vertices the latest visualized algorithm changed.
+        _zoom: The width of a vertex in pixels, below 1 when zoomed out.
+        _offset: The row and column shown in the top left corner.
+        _mazes: The maze types in the order they are generated.
+        _grid_file: The file the grid is saved to and loaded from.
+        _scenarios: The scenarios which can be stepped through.
+        _clusters: The HPA* cluster graph shown as an overlay, or None if hidden.
+        _race_algorithms: The algorithms which are raced against each other.
     """
 
-    def __init__(self, rows: int = 50, width: int = 700) -> None:
+    def __init__(
+        self,
+        rows: int = 50,
+        width: int = 700,
+        grid_file: str = 'grid.pfg',
+        scenario_file: str | None = None,
+        cols: int | None = None,
+        height: int | None = None,
+    ) -> None:
         """Initializes the graphical user interface.
 
         Args:
             rows: The number of rows of the grid.
             width: The width of the window.
+            grid_file: A grid file or MovingAI map which is loaded on start if it
+                exists. Grids are saved to it, unless it is a MovingAI map.
+            scenario_file: A MovingAI scenario file to step through.
+            cols: The number of columns of the grid, defaults to rows.
+            height: The height of the window, defaults to width.
         """
-        self._gap = width // rows
         self._rows = rows
-        self._cols = rows
+        self._cols = cols or rows
         self._width = width
-        self._window = pygame.display.set_mode((width, width))
+        self._height = height or width
+        self._window = pygame.display.set_mode((self._width, self._height))
+        self._states = bytearray()
+        self._state_array = None
+        self._touched = set()
+        self._zoom = 1.0
+        self._offset = [0.0, 0.0]
+        self._mazes = list(Mazes)
+        self._grid_file = grid_file
+        self._scenarios = load_scenarios(scenario_file) if scenario_file else []
+        self._clusters = None
+        self._race_algorithms = [
+            Algorithms.DIJKTRA,
+            Algorithms.A_STAR_SEARCH,
+            Algorithms.BIDIRECTIONAL_SEARCH,
+            Algorithms.BREADTH_FIRST_SEARCH,
+        ]
 
         pygame.display.set_caption("Pathfinding Visualizer")
 
     def _initialize_grid(self) -> list[list[Vertex]]:
         """Initializes an empty grid."""
-        grid = []
-        for row in range(self._rows):
-            grid.append([])
-            for col in range(self._cols):
-                grid[row].append(Vertex(row, col, self._gap, self._rows))
+        self._states = bytearray(self._rows * self._cols)
+        self._state_array = np.frombuffer(self._states, dtype=np.uint8).reshape(self._rows, self._cols)
+        self._touched = set()
+        self._fit_to_window()
+        return lazy_grid(self._states, self._rows, self._cols)
+
+    def _fit_to_window(self) -> None:
+        """Zooms and moves the view so the whole grid is visible."""
+        self._zoom = min(self._width / self._rows, self._height / self._cols)
+        self._offset = [0.0, 0.0]
+
+    def _zoom_at(self, position: tuple[int, int], factor: float) -> None:
+        """Zooms the view, keeping the vertex under position in place."""
+        x, y = position
+        row = self._offset[0] + x / self._zoom
+        col = self._offset[1] + y / self._zoom
+        min_zoom = min(1.0, self._width / self._rows, self._height / self._cols) / 2
+        self._zoom = min(max(self._zoom * factor, min_zoom), _MAX_ZOOM)
+        self._offset = [row - x / self._zoom, col - y / self._zoom]
 
-        return grid
+    def _move_view(self, x: float, y: float) -> None:
+        """Moves the view by a number of pixels."""
+        self._offset[0] += x / self._zoom
+        self._offset[1] += y / self._zoom
+
+    def _to_screen(self, row: float, col: float) -> tuple[int, int]:
+        """Converts a position in the grid to pixels."""
+        return round((row - self._offset[0]) * self._zoom), round((col - self._offset[1]) * self._zoom)
 
     def _generate_maze(
         self,
         grid: list[list[Vertex]],
         start: Vertex,
         destination: Vertex,
-        threshold: float = 0.3,
-    ) -> list[list[Vertex]]:
-        """Generates a random maze."""
+        maze: Mazes = Mazes.RANDOM_OBSTACLES,
+    ) -> None:
+        """Generates a maze which always connects start and destination."""
         self._reset_vertices(grid, True)
-        n = round(len(grid) * len(grid) * threshold)
+        walls = generate_maze(
+            self._rows,
+            self._cols,
+            maze,
+            start=start.get_position() if start else None,
+            destination=destination.get_position() if destination else None,
+        )
+
+        self._state_array[walls & (self._state_array == States.EMPTY)] = States.WALL
+        self._update_clusters()
+
+    def _walls(self) -> np.ndarray:
+        """Returns a boolean array which is True for walls."""
+        return self._state_array == States.WALL
+
+    def _update_clusters(self) -> None:
+        """Rebuilds the cluster graph if it is shown."""
+        if self._clusters is not None:
+            self._clusters = ClusterGraph(self._walls())
+
+    def _toggle_clusters(self) -> None:
+        """Shows or hides the cluster graph."""
+        self._clusters = ClusterGraph(self._walls()) if self._clusters is None else None
+
+    def _save_grid(self, start: Vertex, destination: Vertex) -> None:
+        """Saves the walls, start and destination to the grid file."""
+        if self._grid_file.endswith('.map'): return
+        save_grid(
+            self._grid_file,
+            self._walls(),
+            start=start.get_position() if start else None,
+            destination=destination.get_position() if destination else None,
+        )
+
+    def _load_grid(self) -> tuple[list[list[Vertex]], Vertex, Vertex]:
+        """Loads the grid file, resizing the grid to fit into the window."""
+        if self._grid_file.endswith('.map'):
+            walls = load_map(self._grid_file)
+            start_position = destination_position = None
+        else:
+            grid_file = load_grid(self._grid_file)
+            walls = grid_file.walls
+            start_position, destination_position = grid_file.start, grid_file.destination
+
+        self._rows, self._cols = walls.shape
+        grid = self._initialize_grid()
+        start = destination = None
+        self._state_array[walls] = States.WALL
 
-        for _ in range(n + 1):
-            row = randrange(len(grid))
-            col = randrange(len(grid))
-            if grid[row][col] != start and grid[row][col] != destination:
-                grid[row][col].make_wall()
+        if start_position:
+            start = grid[start_position[0]][start_position[1]]
+            start.make_start()
+
+        if destination_position:
+            destination = grid[destination_position[0]][destination_position[1]]
+            destination.make_destination()
+
+        self._update_clusters()
+        return grid, start, destination
+
+    def _load_scenario(
+        self,
+        grid: list[list[Vertex]],
+        start: Vertex,
+        destination: Vertex,
+    ) -> tuple[Vertex, Vertex]:
+        """Moves start and destination to the next scenario."""
+        scenario: Scenario = self._scenarios.pop(0)
+        self._scenarios.append(scenario)
+        self._reset_vertices(grid)
+
+        for vertex in (start, destination):
+            if vertex:
+                vertex.reset_vertex()
+
+        start = grid[scenario.start[0]][scenario.start[1]]
+        destination = grid[scenario.destination[0]][scenario.destination[1]]
+        start.make_start()
+        destination.make_destination()
+        return start, destination
 
     def draw(self, grid: list[list[Vertex]]) -> None:
-        """Draws the vertices."""
-        for row in grid:
-            for vertex in row:
-                vertex.draw(self._window)
+        """Draws the vertices inside the view."""
+        self._window.fill(Colors.LIGHT_BLUE)
+        self._draw_vertices()
+
+        if self._zoom >= _GRID_LINES_ZOOM:
+            self._draw_lines()
+
+        if self._clusters is not None:
+            self._draw_clusters()
 
-        self._draw_lines()
         pygame.display.update()
 
+    def _visible_range(self) -> tuple[int, int, int, int]:
+        """Returns the first and past-the-end row and column inside the view."""
+        first_row = min(max(0, int(self._offset[0])), self._rows)
+        first_col = min(max(0, int(self._offset[1])), self._cols)
+        last_row = max(min(self._rows, ceil(self._offset[0] + self._width / self._zoom)), first_row)
+        last_col = max(min(self._cols, ceil(self._offset[1] + self._height / self._zoom)), first_col)
+        return first_row, last_row, first_col, last_col
+
+    def _draw_vertices(self) -> None:
+        """Renders the states inside the view to a surface and draws it scaled."""
+        first_row, last_row, first_col, last_col = self._visible_range()
+        if first_row == last_row or first_col == last_col: return
+
+        states = self._state_array[first_row:last_row, first_col:last_col]
+        self._window.blit(render_states(states, self._zoom), self._to_screen(first_row, first_col))
+
     def _draw_lines(self) -> None:
-        """Draws the grid lines."""
-        for i in range(self._rows):
-            pygame.draw.line(self._window, Colors.LIGHT_BLUE, (0, i * self._gap), (self._width, i * self._gap))
-            pygame.draw.line(self._window, Colors.LIGHT_BLUE, (i * self._gap, 0), (i * self._gap, self._width))
+        """Draws the grid lines inside the view."""
+        first_row, last_row, first_col, last_col = self._visible_range()
+        left, top = self._to_screen(first_row, first_col)
+        right, bottom = self._to_screen(last_row, last_col)
+
+        for col in range(first_col, last_col + 1):
+            y = self._to_screen(first_row, col)[1]
+            pygame.draw.line(self._window, Colors.LIGHT_BLUE, (left, y), (right, y))
+
+        for row in range(first_row, last_row + 1):
+            x = self._to_screen(row, first_col)[0]
+            pygame.draw.line(self._window, Colors.LIGHT_BLUE, (x, top), (x, bottom))
+
+    def _draw_clusters(self) -> None:
+        """Draws the cluster borders, entrances and abstract edges of HPA* inside the view."""
+        first_row, last_row, first_col, last_col = self._visible_range()
+        size = self._clusters.cluster_size
+        left, top = self._to_screen(first_row, first_col)
+        right, bottom = self._to_screen(last_row, last_col)
+
+        for col in range(-(-first_col // size) * size, last_col, size):
+            y = self._to_screen(first_row, col)[1]
+            pygame.draw.line(self._window, Colors.PURPLE, (left, y), (right, y), 2)
+
+        for row in range(-(-first_row // size) * size, last_row, size):
+            x = self._to_screen(row, first_col)[0]
+            pygame.draw.line(self._window, Colors.PURPLE, (x, top), (x, bottom), 2)
+
+        # Only the nodes and edges of the clusters inside the view can be visible
+        clusters = self._clusters.clusters_in(first_row, last_row, first_col, last_col)
+
+        for a, b, _ in self._clusters.edges(clusters):
+            pygame.draw.line(
+                self._window,
+                Colors.ORANGE,
+                self._to_screen(a[0] + 0.5, a[1] + 0.5),
+                self._to_screen(b[0] + 0.5, b[1] + 0.5),
+            )
+
+        for row, col in self._clusters.nodes(clusters):
+            pygame.draw.circle(
+                self._window, Colors.PURPLE, self._to_screen(row + 0.5, col + 0.5), max(2, round(self._zoom / 3)))
 
     def _get_clicked_position(self, position: tuple[int, int]) -> tuple[int, int]:
         """Gets the clicked position."""
         x, y = position
-        row = x // self._gap
-        col = y // self._gap
+        row = int(self._offset[0] + x / self._zoom) if self._offset[0] + x / self._zoom >= 0 else -1
+        col = int(self._offset[1] + y / self._zoom) if self._offset[1] + y / self._zoom >= 0 else -1
         return row, col
 
     def _make_vertex(
@@ -103,6 +316,10 @@ class GUI:
         """Creates the start, destination or a wall vertex."""
         position = pygame.mouse.get_pos()
         row, col = self._get_clicked_position(position)
+
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            return grid, start, destination
+
         vertex = grid[row][col]
 
         if not start and vertex != destination and not vertex.is_wall():
@@ -114,6 +331,9 @@ class GUI:
         elif vertex != start and vertex != destination:
             vertex.make_wall()
 
+            if self._clusters is not None:
+                self._clusters.set_wall(row, col, True)
+
         return grid, start, destination
 
     def _reset_vertex(
@@ -125,7 +345,15 @@ class GUI:
         """Resets the start, destination or a wall vertex."""
         position = pygame.mouse.get_pos()
         row, col = self._get_clicked_position(position)
+
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            return grid, start, destination
+
         vertex = grid[row][col]
+
+        if self._clusters is not None and vertex.is_wall():
+            self._clusters.set_wall(row, col, False)
+
         vertex.reset_vertex()
 
         if vertex == start:
@@ -136,19 +364,14 @@ class GUI:
         return grid, start, destination
 
     def _reset_vertices(self, grid: list[list[Vertex]], is_maze: bool = False) -> None:
-        """Resets all vertices by coloring them white."""
-        for row in grid:
-            for vertex in row:
-                if vertex.is_visited() or vertex.is_path():
-                    vertex.reset_vertex()
-                elif is_maze and vertex.is_wall():
-                    vertex.reset_vertex()
-
-    def _update_neighbors(self, grid: list[list[Vertex]]) -> None:
-        """Updates the neighbor vertices."""
-        for row in grid:
-            for vertex in row:
-                vertex.update_neighbors(grid)
+        """Resets the vertices visited by the latest algorithm, and all walls for a maze, by coloring them white."""
+        for vertex in self._touched:
+            if vertex.is_visited() or vertex.is_path():
+                vertex.reset_vertex()
+        self._touched = set()
+
+        if is_maze:
+            self._state_array[self._state_array == States.WALL] = States.EMPTY
 
     def _visualize_algorithm(
         self,
@@ -159,18 +382,51 @@ class GUI:
     ) -> None:
         """Visualizes a pathfinding algorithm."""
         self._reset_vertices(grid)
-        self._update_neighbors(grid)
-
-        if algorithm == Algorithms.DIJKTRA:
-            Pathfinder.dijkstra(self, grid, start, destination)
-        elif algorithm == Algorithms.A_STAR_SEARCH:
-            Pathfinder.a_star_search(self, grid, start, destination)
-        elif algorithm == Algorithms.BIDIRECTIONAL_SEARCH:
-            Pathfinder.bidirectional_search(self, grid, start, destination)
-        elif algorithm == Algorithms.BREADTH_FIRST_SEARCH:
-            Pathfinder.breadth_first_search(self, grid, start, destination)
-        elif algorithm == Algorithms.DEPTH_FIRST_SEARCH:
-            Pathfinder.depth_first_search(self, grid, start, destination)
+
+        steps = Pathfinder.run(algorithm, grid, start, destination)
+
+        # Keep the animation time of large grids comparable to the default 50x50 grid
+        steps_per_frame = max(1, self._rows * self._cols // 2500)
+
+        for i, (vertex, _) in enumerate(steps):
+            self._touched.add(vertex)
+            if i % steps_per_frame: continue
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+
+            self.draw(grid)
+
+    def _race(self, grid: list[list[Vertex]], start: Vertex, destination: Vertex) -> None:
+        """Races several algorithms side by side until esc is pressed."""
+        self._reset_vertices(grid)
+        race = Race(
+            self._window,
+            self._states,
+            self._rows,
+            self._cols,
+            start.get_position(),
+            destination.get_position(),
+            self._race_algorithms,
+        )
+
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        return
+                    if event.key == pygame.K_t:
+                        race.lockstep = not race.lockstep
+
+            if not race.is_finished():
+                race.step()
+
+            race.draw()
+            pygame.display.update()
 
     def run(self) -> None:
         """Runs the pathfinding visualizer."""
@@ -178,6 +434,9 @@ class GUI:
         start = destination = None
         grid = self._initialize_grid()
 
+        if os.path.exists(self._grid_file):
+            grid, start, destination = self._load_grid()
+
         while run:
             self.draw(grid)
 
@@ -186,6 +445,10 @@ class GUI:
                 if event.type == pygame.QUIT:
                     run = False
 
+                # Zoom
+                if event.type == pygame.MOUSEWHEEL:
+                    self._zoom_at(pygame.mouse.get_pos(), 1.25 ** event.y)
+
                 # Left click
                 if pygame.mouse.get_pressed()[0]:
                     grid, start, destination = self._make_vertex(grid, start, destination)
@@ -196,8 +459,18 @@ class GUI:
 
                 if event.type == pygame.KEYDOWN:
 
+                    # Move the view
+                    if event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+                        x = (event.key == pygame.K_RIGHT) - (event.key == pygame.K_LEFT)
+                        y = (event.key == pygame.K_DOWN) - (event.key == pygame.K_UP)
+                        self._move_view(x * self._width / 4, y * self._height / 4)
+
+                    # Fit grid into the window
+                    elif event.key == pygame.K_f:
+                        self._fit_to_window()
+
                     # Dijkstra's algorithm
-                    if event.key == pygame.K_1 and start and destination:
+                    elif event.key == pygame.K_1 and start and destination:
                         self._visualize_algorithm(grid, start, destination, Algorithms.DIJKTRA)
 
                     # A* search algorithm
@@ -216,14 +489,44 @@ class GUI:
                     elif event.key == pygame.K_5 and start and destination:
                         self._visualize_algorithm(grid, start, destination, Algorithms.DEPTH_FIRST_SEARCH)
 
+                    # Iterative-deepening A* search
+                    elif event.key == pygame.K_6 and start and destination:
+                        self._visualize_algorithm(grid, start, destination, Algorithms.IDA_STAR_SEARCH)
+
+                    # Simplified memory-bounded A* search
+                    elif event.key == pygame.K_7 and start and destination:
+                        self._visualize_algorithm(grid, start, destination, Algorithms.SMA_STAR_SEARCH)
+
+                    # Race algorithms side by side
+                    elif event.key == pygame.K_r and start and destination:
+                        self._race(grid, start, destination)
+
                     # Generate maze
                     elif event.key == pygame.K_m:
-                        self._generate_maze(grid, start, destination)
+                        self._generate_maze(grid, start, destination, self._mazes[0])
+                        self._mazes.append(self._mazes.pop(0))
+
+                    # Save grid
+                    elif event.key == pygame.K_s:
+                        self._save_grid(start, destination)
+
+                    # Load grid
+                    elif event.key == pygame.K_l and os.path.exists(self._grid_file):
+                        grid, start, destination = self._load_grid()
+
+                    # Next scenario
+                    elif event.key == pygame.K_n and self._scenarios:
+                        start, destination = self._load_scenario(grid, start, destination)
+
+                    # Cluster graph overlay
+                    elif event.key == pygame.K_h:
+                        self._toggle_clusters()
 
                     # Reset grid
                     elif event.key == pygame.K_c:
                         start = destination = None
                         grid = self._initialize_grid()
+                        self._update_clusters()
                         self.draw(grid)
 
         pygame.quit()
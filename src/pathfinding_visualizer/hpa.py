@@ -0,0 +1,360 @@
+"""Hierarchical pathfinding (HPA*) for very large grids.
+
+HPA* splits the grid into square clusters. Wherever two neighboring clusters
+share a run of open vertices along their border, one or two entrances are
+placed on it: in the middle of short runs, at both ends of long ones. The
+vertices on either side of an entrance become nodes of an abstract graph,
+connected to each other with cost 1 and to all other nodes of their cluster
+with the exact distance inside the cluster, precomputed by breadth-first search.
+
+A query temporarily connects start and destination to the nodes of their
+clusters, runs A* on the small abstract graph, and refines every abstract
+edge into vertices by a search restricted to a single cluster. Since paths
+have to cross borders at entrances, they are not always the shortest ones,
+only close to them. benchmark.py --hpa compares their costs with A*.
+
+When a wall changes, only the borders it touches and the clusters next to
+them are rebuilt.
+
+Typical usage example:
+    clusters = ClusterGraph(walls, cluster_size=16)
+    path = clusters.find_path((0, 0), (1999, 1999))
+    clusters.set_wall(10, 10, True)
+"""
+from __future__ import annotations
+from collections import deque
+from collections.abc import Iterator
+from heapq import heappop, heappush
+import numpy as np
+
+# Runs of open vertices at least this long get an entrance at each end
+_LONG_ENTRANCE = 6
+
+
+class ClusterGraph:
+    """Class which implements the abstract graph of HPA* over a grid.
+
+    Vertices are addressed by flat indices row * cols + col internally.
+
+    Attributes:
+        rows: The number of rows of the grid.
+        cols: The number of columns of the grid.
+        cluster_size: The number of rows and columns of a cluster.
+        cluster_rows: The number of clusters along the rows.
+        cluster_cols: The number of clusters along the columns.
+        _open: Flags which are 1 for every vertex that is not a wall.
+        _borders: Entrances as (vertex, vertex) pairs for each pair of neighboring clusters.
+        _inter: Nodes across the border of a cluster for each node.
+        _intra: Distances between the nodes of a cluster for each cluster.
+    """
+
+    def __init__(self, walls: np.ndarray, cluster_size: int = 10) -> None:
+        """Builds the abstract graph.
+
+        Args:
+            walls: A boolean array of shape (rows, cols) which is True for walls.
+            cluster_size: The number of rows and columns of a cluster.
+        """
+        self.rows, self.cols = walls.shape
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+        self._open = bytearray((~walls.astype(bool)).ravel().tobytes())
+        self._borders = {}
+        self._inter = {}
+        self._intra = {}
+
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            for neighbor in self._neighbor_clusters(cluster):
+                if neighbor > cluster:
+                    self._build_border(cluster, neighbor)
+
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            self._build_intra(cluster)
+
+    def find_path(self, start: tuple[int, int], destination: tuple[int, int]) -> list[tuple[int, int]] | None:
+        """Finds a path between two positions, which is not always the shortest one.
+
+        Returns:
+            The positions of the path from start to destination, or None if
+            there is no path.
+        """
+        source = start[0] * self.cols + start[1]
+        target = destination[0] * self.cols + destination[1]
+
+        if not self._open[source] or not self._open[target]:
+            return None
+
+        source_cluster = self._cluster_of(source)
+        target_cluster = self._cluster_of(target)
+
+        if source_cluster == target_cluster:
+            local_path = self._local_path(source, target)
+            if local_path:
+                return [divmod(vertex, self.cols) for vertex in local_path]
+
+        # Connect start and destination to the nodes of their clusters
+        from_source = self._distances(source, self._nodes(source_cluster))
+        to_target = self._distances(target, self._nodes(target_cluster))
+
+        abstract_path = self._abstract_search(source, target, from_source, to_target)
+        if abstract_path is None:
+            return None
+
+        path = [source]
+        for previous, current in zip(abstract_path, abstract_path[1:]):
+            if self._cluster_of(previous) == self._cluster_of(current):
+                path.extend(self._local_path(previous, current)[1:])
+            else:
+                path.append(current)
+
+        return [divmod(vertex, self.cols) for vertex in path]
+
+    def set_wall(self, row: int, col: int, is_wall: bool) -> None:
+        """Updates a vertex and rebuilds the parts of the graph it affects."""
+        vertex = row * self.cols + col
+        if self._open[vertex] == (not is_wall): return
+        self._open[vertex] = not is_wall
+
+        cluster = self._cluster_of(vertex)
+        affected = {cluster}
+        row_start, row_end, col_start, col_end = self._bounds(cluster)
+
+        for neighbor in self._neighbor_clusters(cluster):
+            neighbor_row, neighbor_col = divmod(neighbor, self.cluster_cols)
+            cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+
+            if ((neighbor_row < cluster_row and row == row_start)
+                    or (neighbor_row > cluster_row and row == row_end - 1)
+                    or (neighbor_col < cluster_col and col == col_start)
+                    or (neighbor_col > cluster_col and col == col_end - 1)):
+                self._build_border(min(cluster, neighbor), max(cluster, neighbor))
+                affected.add(neighbor)
+
+        for cluster in affected:
+            self._build_intra(cluster)
+
+    def clusters_in(self, first_row: int, last_row: int, first_col: int, last_col: int) -> set[int]:
+        """Returns the clusters overlapping the given first and past-the-end rows and columns."""
+        size = self.cluster_size
+        return {
+            cluster_row * self.cluster_cols + cluster_col
+            for cluster_row in range(first_row // size, -(-last_row // size))
+            for cluster_col in range(first_col // size, -(-last_col // size))
+        }
+
+    def nodes(self, clusters: set[int] | None = None) -> Iterator[tuple[int, int]]:
+        """Yields the positions of all nodes of the abstract graph, or only of those inside some clusters."""
+        if clusters is None:
+            clusters = range(self.cluster_rows * self.cluster_cols)
+
+        for cluster in clusters:
+            for node in self._intra[cluster]:
+                yield divmod(node, self.cols)
+
+    def edges(self, clusters: set[int] | None = None) -> Iterator[tuple[tuple[int, int], tuple[int, int], int]]:
+        """Yields every edge of the abstract graph once with its cost, or only those touching some clusters."""
+        if clusters is None:
+            clusters = set(range(self.cluster_rows * self.cluster_cols))
+
+        for cluster in clusters:
+            for node, neighbors in self._intra[cluster].items():
+                for neighbor in self._inter.get(node, ()):
+                    if node < neighbor or self._cluster_of(neighbor) not in clusters:
+                        yield divmod(node, self.cols), divmod(neighbor, self.cols), 1
+
+                for neighbor, cost in neighbors.items():
+                    if node < neighbor:
+                        yield divmod(node, self.cols), divmod(neighbor, self.cols), cost
+
+    def _cluster_of(self, vertex: int) -> int:
+        """Returns the cluster a vertex belongs to."""
+        row, col = divmod(vertex, self.cols)
+        return (row // self.cluster_size) * self.cluster_cols + col // self.cluster_size
+
+    def _bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        """Returns the first and past-the-end row and column of a cluster."""
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        row_start = cluster_row * self.cluster_size
+        col_start = cluster_col * self.cluster_size
+        return (
+            row_start,
+            min(row_start + self.cluster_size, self.rows),
+            col_start,
+            min(col_start + self.cluster_size, self.cols),
+        )
+
+    def _neighbor_clusters(self, cluster: int) -> list[int]:
+        """Returns the clusters sharing a border with a cluster."""
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        neighbors = []
+
+        if cluster_row > 0:
+            neighbors.append(cluster - self.cluster_cols)
+        if cluster_row < self.cluster_rows - 1:
+            neighbors.append(cluster + self.cluster_cols)
+        if cluster_col > 0:
+            neighbors.append(cluster - 1)
+        if cluster_col < self.cluster_cols - 1:
+            neighbors.append(cluster + 1)
+
+        return neighbors
+
+    def _nodes(self, cluster: int) -> set[int]:
+        """Returns the nodes of the abstract graph inside a cluster."""
+        nodes = set()
+
+        for neighbor in self._neighbor_clusters(cluster):
+            for first, second in self._borders.get((min(cluster, neighbor), max(cluster, neighbor)), ()):
+                nodes.add(first if neighbor > cluster else second)
+
+        return nodes
+
+    def _build_border(self, first: int, second: int) -> None:
+        """Places the entrances between two neighboring clusters, first < second."""
+        for a, b in self._borders.pop((first, second), ()):
+            for node, other in ((a, b), (b, a)):
+                self._inter[node].discard(other)
+                if not self._inter[node]:
+                    del self._inter[node]
+
+        row_start, row_end, col_start, col_end = self._bounds(first)
+
+        # The second cluster is either below or to the right of the first one
+        if second == first + self.cluster_cols:
+            pairs = [(row_end - 1) * self.cols + col for col in range(col_start, col_end)]
+            offset = self.cols
+        else:
+            pairs = [row * self.cols + col_end - 1 for row in range(row_start, row_end)]
+            offset = 1
+
+        entrances = []
+        run = []
+
+        for vertex in pairs + [None]:
+            if vertex is not None and self._open[vertex] and self._open[vertex + offset]:
+                run.append(vertex)
+                continue
+
+            if len(run) >= _LONG_ENTRANCE:
+                entrances.extend((run[0], run[-1]))
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+
+        transitions = [(vertex, vertex + offset) for vertex in entrances]
+        self._borders[(first, second)] = transitions
+
+        for a, b in transitions:
+            self._inter.setdefault(a, set()).add(b)
+            self._inter.setdefault(b, set()).add(a)
+
+    def _build_intra(self, cluster: int) -> None:
+        """Computes the distances between all nodes of a cluster."""
+        nodes = self._nodes(cluster)
+        distances = {}
+
+        for node in nodes:
+            reachable = self._distances(node, nodes)
+            reachable.pop(node, None)
+            distances[node] = reachable
+
+        self._intra[cluster] = distances
+
+    def _search(self, source: int, targets: set[int]) -> tuple[dict[int, int], dict[int, int]]:
+        """Breadth-first search which stays inside the cluster of source.
+
+        Returns:
+            The predecessor and distance of every reached vertex. The search
+            stops as soon as all targets are reached.
+        """
+        row_start, row_end, col_start, col_end = self._bounds(self._cluster_of(source))
+        cols = self.cols
+        is_open = self._open
+        came_from = {source: -1}
+        distances = {source: 0}
+        queue = deque([source])
+        remaining = len(targets) - (source in targets)
+
+        while queue and remaining > 0:
+            current = queue.popleft()
+            distance = distances[current] + 1
+            row, col = divmod(current, cols)
+            neighbors = []
+
+            if row > row_start: neighbors.append(current - cols)
+            if row < row_end - 1: neighbors.append(current + cols)
+            if col > col_start: neighbors.append(current - 1)
+            if col < col_end - 1: neighbors.append(current + 1)
+
+            for neighbor in neighbors:
+                if is_open[neighbor] and neighbor not in distances:
+                    came_from[neighbor] = current
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+                    if neighbor in targets:
+                        remaining -= 1
+
+        return came_from, distances
+
+    def _distances(self, source: int, targets: set[int]) -> dict[int, int]:
+        """Returns the distances inside the cluster of source to all reachable targets."""
+        _, distances = self._search(source, targets)
+        return {target: distances[target] for target in targets if target in distances}
+
+    def _local_path(self, source: int, target: int) -> list[int] | None:
+        """Returns a shortest path which stays inside the cluster of source."""
+        came_from, _ = self._search(source, {target})
+        if target not in came_from:
+            return None
+
+        path = []
+        current = target
+        while current != -1:
+            path.append(current)
+            current = came_from[current]
+        path.reverse()
+        return path
+
+    def _abstract_search(
+        self,
+        source: int,
+        target: int,
+        from_source: dict[int, int],
+        to_target: dict[int, int],
+    ) -> list[int] | None:
+        """A* search on the abstract graph extended by start and destination."""
+        target_row, target_col = divmod(target, self.cols)
+        g_score = {source: 0}
+        came_from = {}
+        heap = [(0, 0, source)]
+
+        while heap:
+            _, g, current = heappop(heap)
+            if g > g_score[current]: continue
+
+            if current == target:
+                path = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    path.append(current)
+                path.reverse()
+                return path
+
+            neighbors = list(self._intra[self._cluster_of(current)].get(current, {}).items())
+            neighbors.extend((neighbor, 1) for neighbor in self._inter.get(current, ()))
+            if current == source:
+                neighbors.extend(from_source.items())
+            if current in to_target:
+                neighbors.append((target, to_target[current]))
+
+            for neighbor, cost in neighbors:
+                new_g_score = g + cost
+
+                if new_g_score < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = new_g_score
+                    came_from[neighbor] = current
+                    row, col = divmod(neighbor, self.cols)
+                    heappush(heap, (new_g_score + abs(row - target_row) + abs(col - target_col), new_g_score, neighbor))
+
+        return None
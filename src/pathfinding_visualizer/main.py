@@ -3,9 +3,20 @@
 Typical usage example:
     window = GUI(rows=50, width=700)
     window.run()
+
+    window = GUI(rows=1000, cols=3000, width=1200, height=800)
+    window.run()
+
+To open a saved grid or a MovingAI map and step through its scenarios:
+    python main.py arena.map arena.map.scen
 """
+import sys
 from gui import GUI
 
 if __name__ == '__main__':
-    window = GUI()
+    if len(sys.argv) > 1:
+        window = GUI(grid_file=sys.argv[1], scenario_file=sys.argv[2] if len(sys.argv) > 2 else None)
+    else:
+        window = GUI()
+
     window.run()
@@ -0,0 +1,219 @@
+"""Generates mazes and terrain for the pathfinding visualizer.
+
+All generators write into a compact boolean wall array of shape (rows, cols),
+indexed the same way as the grid of the visualizer. The array can be applied
+to the grid or fed directly to headless benchmarks of the pathfinders.
+
+Supported mazes:
+- Recursive backtracker: a perfect maze with long, winding corridors.
+- Kruskal: a perfect maze with many short dead ends.
+- Caves: organic caves grown by a cellular automaton.
+- Random obstacles: walls scattered uniformly at random.
+
+Perfect mazes are carved on a lattice of cells at even rows and columns, so
+every open vertex is reachable from every other. Caves and random obstacles
+guarantee a path by carving a random corridor between start and destination.
+
+Typical usage example:
+    walls = generate_maze(2000, 2000, Mazes.KRUSKAL, seed=42)
+"""
+from __future__ import annotations
+from itertools import permutations
+import numpy as np
+from utils import Mazes
+
+# Row and column offsets of the four directions between cells
+_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_ORDERS = tuple(permutations(range(4)))
+
+
+def generate_maze(
+    rows: int,
+    cols: int,
+    maze: Mazes,
+    seed: int | None = None,
+    start: tuple[int, int] | None = None,
+    destination: tuple[int, int] | None = None,
+    density: float = 0.3,
+) -> np.ndarray:
+    """Generates a wall array.
+
+    Args:
+        rows: The number of rows of the grid.
+        cols: The number of columns of the grid.
+        maze: The kind of maze to generate.
+        seed: Seed of the random number generator, for reproducible mazes.
+        start: Position of the start vertex, which is kept open.
+        destination: Position of the destination vertex, which is kept open.
+        density: Fraction of walls for random obstacles and initial caves.
+
+    Returns:
+        A boolean array of shape (rows, cols) which is True for walls.
+
+    Raises:
+        ValueError: If maze is not one of the supported mazes.
+    """
+    rng = np.random.default_rng(seed)
+
+    if maze == Mazes.RECURSIVE_BACKTRACKER:
+        walls = _recursive_backtracker(rows, cols, rng)
+    elif maze == Mazes.KRUSKAL:
+        walls = _kruskal(rows, cols, rng)
+    elif maze == Mazes.CAVES:
+        walls = _caves(rows, cols, rng, density + 0.15)
+    elif maze == Mazes.RANDOM_OBSTACLES:
+        walls = rng.random((rows, cols)) < density
+    else:
+        raise ValueError(f'Unsupported maze {maze}.')
+
+    is_perfect = maze in (Mazes.RECURSIVE_BACKTRACKER, Mazes.KRUSKAL)
+
+    for position in (start, destination):
+        if position is not None:
+            _open(walls, position, is_perfect)
+
+    if not is_perfect and start is not None and destination is not None:
+        _carve_corridor(walls, start, destination, rng)
+
+    return walls
+
+
+def _recursive_backtracker(rows: int, cols: int, rng: np.random.Generator) -> np.ndarray:
+    """Carves a perfect maze with a depth-first search over the cells."""
+    height, width = (rows + 1) // 2, (cols + 1) // 2
+    orders = rng.integers(0, len(_ORDERS), height * width).tolist()
+    progress = bytearray(height * width)
+    visited = bytearray(height * width)
+    passages = []
+
+    visited[0] = 1
+    stack = [0]
+
+    while stack:
+        cell = stack[-1]
+        step = progress[cell]
+
+        if step == 4:
+            stack.pop()
+            continue
+
+        progress[cell] = step + 1
+        d_row, d_col = _DIRECTIONS[_ORDERS[orders[cell]][step]]
+        row, col = divmod(cell, width)
+        next_row, next_col = row + d_row, col + d_col
+
+        if 0 <= next_row < height and 0 <= next_col < width:
+            neighbor = next_row * width + next_col
+
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                passages.append((2 * row + d_row) * cols + 2 * col + d_col)
+                stack.append(neighbor)
+
+    walls = np.ones((rows, cols), dtype=bool)
+    walls[::2, ::2] = False
+    walls.flat[passages] = False
+    return walls
+
+
+def _kruskal(rows: int, cols: int, rng: np.random.Generator) -> np.ndarray:
+    """Carves a perfect maze by joining cells through randomly ordered passages.
+
+    Kruskal's algorithm opens the passages in random order unless they join
+    cells which are already connected, which yields the minimum spanning tree
+    for that order. The same tree is found by Boruvka's algorithm in a
+    logarithmic number of vectorized rounds: each group of connected cells
+    opens its earliest passage to another group, then the groups are merged.
+    """
+    height, width = (rows + 1) // 2, (cols + 1) // 2
+    cells = np.arange(height * width).reshape(height, width)
+    positions = np.arange(rows * cols).reshape(rows, cols)
+
+    # Candidate passages between horizontally and vertically adjacent cells
+    first = np.concatenate((cells[:, :-1].ravel(), cells[:-1, :].ravel()))
+    second = np.concatenate((cells[:, 1:].ravel(), cells[1:, :].ravel()))
+    passages = np.concatenate((positions[::2, 1::2][:, :width - 1].ravel(), positions[1::2, ::2][:height - 1].ravel()))
+    order = rng.permutation(len(first))
+    first, second, passages = first[order], second[order], passages[order]
+
+    group = np.arange(height * width)
+    carved = []
+
+    while True:
+        first_group = group[first]
+        second_group = group[second]
+        between = first_group != second_group
+        if not between.any(): break
+
+        first, second, passages = first[between], second[between], passages[between]
+        first_group, second_group = first_group[between], second_group[between]
+
+        # The earliest passage leading out of every group
+        earliest = np.full(height * width, len(passages))
+        np.minimum.at(earliest, first_group, np.arange(len(passages)))
+        np.minimum.at(earliest, second_group, np.arange(len(passages)))
+        groups = np.flatnonzero(earliest < len(passages))
+        chosen = earliest[groups]
+        is_chosen = np.zeros(len(passages), dtype=bool)
+        is_chosen[chosen] = True
+        carved.append(passages[is_chosen])
+
+        # Point every group to the one its passage leads to, two groups choosing the same passage form a root
+        targets = np.where(first_group[chosen] == groups, second_group[chosen], first_group[chosen])
+        parent = np.arange(height * width)
+        parent[groups] = targets
+        is_root = (parent[targets] == groups) & (groups < targets)
+        parent[groups[is_root]] = groups[is_root]
+
+        while not np.array_equal(parent[parent], parent):
+            parent = parent[parent]
+
+        group = parent[group]
+
+    walls = np.ones((rows, cols), dtype=bool)
+    walls[::2, ::2] = False
+    walls.flat[np.concatenate(carved) if carved else []] = False
+    return walls
+
+
+def _caves(rows: int, cols: int, rng: np.random.Generator, density: float, steps: int = 4) -> np.ndarray:
+    """Grows caves by repeatedly smoothing random noise with a cellular automaton."""
+    walls = rng.random((rows, cols)) < density
+
+    for _ in range(steps):
+        padded = np.pad(walls, 1, constant_values=True).astype(np.uint8)
+        neighbors = sum(
+            padded[1 + d_row:rows + 1 + d_row, 1 + d_col:cols + 1 + d_col]
+            for d_row in (-1, 0, 1)
+            for d_col in (-1, 0, 1)
+            if d_row or d_col
+        )
+        walls = (neighbors >= 5) | (walls & (neighbors >= 4))
+
+    return walls
+
+
+def _open(walls: np.ndarray, position: tuple[int, int], is_perfect: bool) -> None:
+    """Removes the wall at a position, connecting it to the maze if needed."""
+    row, col = position
+    walls[row, col] = False
+
+    # Between four walls of a perfect maze, open the passage above instead
+    if is_perfect and row % 2 and col % 2:
+        walls[row - 1, col] = False
+
+
+def _carve_corridor(
+    walls: np.ndarray,
+    start: tuple[int, int],
+    destination: tuple[int, int],
+    rng: np.random.Generator,
+) -> None:
+    """Opens a random monotone corridor from start to destination."""
+    d_row = destination[0] - start[0]
+    d_col = destination[1] - start[1]
+    moves = rng.permutation(np.repeat((True, False), (abs(d_row), abs(d_col))))
+
+    path_rows = start[0] + np.concatenate(([0], np.cumsum(moves * np.sign(d_row))))
+    path_cols = start[1] + np.concatenate(([0], np.cumsum(~moves * np.sign(d_col))))
+    walls[path_rows, path_cols] = False
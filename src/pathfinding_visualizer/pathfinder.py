@@ -7,43 +7,84 @@ a path from start to destination can be found using these algorithms:
 - Bidirectional search
 - Breadth-first search
 - Depth-first search
+- IDA* search, which only keeps the current path and a bounded transposition table
+- SMA* search, which keeps at most a fixed number of nodes of the search tree
+
+Costs are only stored for the vertices an algorithm reaches, so a short search
+on a large grid doesn't pay for the whole grid.
+
+Every algorithm is a generator which yields each vertex right after it changed
+its state together with the current size of the frontier, and returns whether
+a path was found. The memory-bounded IDA* and SMA* searches return None instead
+if they gave up, since then a path may still exist. While the path is
+reconstructed, the frontier is reported as 0.
+The caller decides what to do in between steps: the GUI draws the grid,
+headless benchmarks just count them.
 """
-import pygame
+from collections.abc import Generator
+from heapq import heapify, heappop, heappush
 from queue import PriorityQueue, deque
 from vertex import Vertex
-from utils import AStarSearch, BidirectionalSearch, Path
+from utils import Algorithms, AStarSearch, BidirectionalSearch, Path, SearchLeaves, SearchNode, SMAStarSearch
+
+# Memory-bounded searches give up after this many expansions per open vertex, but never before _MIN_EXPANSIONS.
+# The open vertices are only counted once a search got that far, so short searches don't pay for it.
+_GIVE_UP_FACTOR = 8
+_MIN_EXPANSIONS = 2 ** 16
 
 
 class Pathfinder:
     """Class which implements the pathfinding algorithms."""
 
     @staticmethod
-    def dijkstra(gui: object, grid: list[list[Vertex]], start: Vertex, destination: Vertex) -> bool:
-        """Visualizes Dijkstra's algorithm."""
+    def run(
+        algorithm: Algorithms,
+        grid: list[list[Vertex]],
+        start: Vertex,
+        destination: Vertex,
+    ) -> Generator[tuple[Vertex, int], None, bool]:
+        """Runs the given pathfinding algorithm."""
+        if algorithm == Algorithms.DIJKTRA:
+            return Pathfinder.dijkstra(grid, start, destination)
+        elif algorithm == Algorithms.A_STAR_SEARCH:
+            return Pathfinder.a_star_search(grid, start, destination)
+        elif algorithm == Algorithms.BIDIRECTIONAL_SEARCH:
+            return Pathfinder.bidirectional_search(grid, start, destination)
+        elif algorithm == Algorithms.BREADTH_FIRST_SEARCH:
+            return Pathfinder.breadth_first_search(grid, start, destination)
+        elif algorithm == Algorithms.DEPTH_FIRST_SEARCH:
+            return Pathfinder.depth_first_search(grid, start, destination)
+        elif algorithm == Algorithms.IDA_STAR_SEARCH:
+            return Pathfinder.ida_star_search(grid, start, destination)
+        elif algorithm == Algorithms.SMA_STAR_SEARCH:
+            return Pathfinder.sma_star_search(grid, start, destination)
+
+    @staticmethod
+    def dijkstra(
+        grid: list[list[Vertex]],
+        start: Vertex,
+        destination: Vertex,
+    ) -> Generator[tuple[Vertex, int], None, bool]:
+        """Runs Dijkstra's algorithm."""
         count = 0
         queue = PriorityQueue()
         queue.put((0, count, start))
         visited = {start}
         came_from = {}
-        costs = {vertex: float('inf') for row in grid for vertex in row}
-        costs[start] = 0
+        costs = {start: 0}
 
         while not queue.empty():
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-
             current = queue.get()[2]
             visited.add(current)
 
             if current == destination:
-                Path.reconstruct(gui, grid, came_from, destination)
+                yield from Path.reconstruct(came_from, destination)
                 start.make_start()
                 return True
 
             for neighbor in current.neighbors:
                 new_cost = costs[current] + 1
-                if new_cost < costs[neighbor]:
+                if new_cost < costs.get(neighbor, float('inf')):
                     came_from[neighbor] = current
                     costs[neighbor] = new_cost
                     if neighbor not in visited:
@@ -54,39 +95,37 @@ class Pathfinder:
             if current != start:
                 current.make_visited()
 
-            gui.draw(grid)
+            yield current, queue.qsize()
 
         return False
 
     @staticmethod
-    def a_star_search(gui: object, grid: list[list[Vertex]], start: Vertex, destination: Vertex) -> bool:
-        """Visualizes A* search."""
+    def a_star_search(
+        grid: list[list[Vertex]],
+        start: Vertex,
+        destination: Vertex,
+    ) -> Generator[tuple[Vertex, int], None, bool]:
+        """Runs A* search."""
         count = 0
         queue = PriorityQueue()
         queue.put((0, count, start))
         visited = {start}
         came_from = {}
-        g_score = {vertex: float('inf') for row in grid for vertex in row}
-        g_score[start] = 0
-        f_score = {vertex: float('inf') for row in grid for vertex in row}
-        f_score[start] = AStarSearch.manhatten_distance(start, destination)
+        g_score = {start: 0}
+        f_score = {start: AStarSearch.manhatten_distance(start, destination)}
 
         while not queue.empty():
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-
             current = queue.get()[2]
             visited.add(current)
 
             if current == destination:
-                Path.reconstruct(gui, grid, came_from, destination)
+                yield from Path.reconstruct(came_from, destination)
                 start.make_start()
                 return True
 
             for neighbor in current.neighbors:
                 new_g_score = g_score[current] + 1
-                if new_g_score < g_score[neighbor]:
+                if new_g_score < g_score.get(neighbor, float('inf')):
                     came_from[neighbor] = current
                     g_score[neighbor] = new_g_score
                     f_score[neighbor] = new_g_score + AStarSearch.manhatten_distance(neighbor, destination)
@@ -98,13 +137,20 @@ class Pathfinder:
             if current != start:
                 current.make_visited()
 
-            gui.draw(grid)
+            yield current, queue.qsize()
 
         return False
 
     @staticmethod
-    def bidirectional_search(gui: object, grid: list[list[Vertex]], start: Vertex, destination: Vertex) -> bool:
-        """Visualizes bidirectional search."""
+    def bidirectional_search(
+        grid: list[list[Vertex]],
+        start: Vertex,
+        destination: Vertex,
+    ) -> Generator[tuple[Vertex, int], None, bool]:
+        """Runs bidirectional search."""
+        if start == destination:
+            return True
+
         queue_src = deque()
         queue_src.append(start)
         queue_dst = deque()
@@ -116,13 +162,15 @@ class Pathfinder:
         intersection = -1
 
         while queue_src and queue_dst and intersection == -1:
-            BidirectionalSearch.bfs(gui, grid, start, queue_src, visited_src, came_from_src)
-            BidirectionalSearch.bfs(gui, grid, destination, queue_dst, visited_dst, came_from_dst)
+            current = BidirectionalSearch.bfs(start, queue_src, visited_src, came_from_src)
+            yield current, len(queue_src) + len(queue_dst)
+            current = BidirectionalSearch.bfs(destination, queue_dst, visited_dst, came_from_dst)
+            yield current, len(queue_src) + len(queue_dst)
 
             intersection = BidirectionalSearch.is_intersecting(visited_src, visited_dst)
 
             if intersection != -1:
-                Path.reconstruct_bidirectional(gui, grid, came_from_src, came_from_dst, intersection.pop())
+                yield from Path.reconstruct_bidirectional(came_from_src, came_from_dst, intersection.pop())
                 start.make_start()
                 destination.make_destination()
                 return True
@@ -130,23 +178,23 @@ class Pathfinder:
         return False
 
     @staticmethod
-    def breadth_first_search(gui: object, grid: list[list[Vertex]], start: Vertex, destination: Vertex) -> bool:
-        """Visualizes breadth-first search."""
+    def breadth_first_search(
+        grid: list[list[Vertex]],
+        start: Vertex,
+        destination: Vertex,
+    ) -> Generator[tuple[Vertex, int], None, bool]:
+        """Runs breadth-first search."""
         queue = deque()
         queue.append(start)
         visited = {start}
         came_from = {}
 
         while queue:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-
             current = queue.popleft()
             visited.add(current)
 
             if current == destination:
-                Path.reconstruct(gui, grid, came_from, destination)
+                yield from Path.reconstruct(came_from, destination)
                 start.make_start()
                 return True
 
@@ -159,28 +207,28 @@ class Pathfinder:
             if current != start:
                 current.make_visited()
 
-            gui.draw(grid)
+            yield current, len(queue)
 
         return False
 
     @staticmethod
-    def depth_first_search(gui: object, grid: list[list[Vertex]], start: Vertex, destination: Vertex) -> bool:
-        """Visualizes depth-first search."""
+    def depth_first_search(
+        grid: list[list[Vertex]],
+        start: Vertex,
+        destination: Vertex,
+    ) -> Generator[tuple[Vertex, int], None, bool]:
+        """Runs depth-first search."""
         stack = []
         stack.append(start)
         visited = {start}
         came_from = {}
 
         while stack:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-
             current = stack.pop()
             visited.add(current)
 
             if current == destination:
-                Path.reconstruct(gui, grid, came_from, destination)
+                yield from Path.reconstruct(came_from, destination)
                 start.make_start()
                 return True
 
@@ -193,6 +241,215 @@ class Pathfinder:
             if current != start:
                 current.make_visited()
 
-            gui.draw(grid)
+            yield current, len(stack)
+
+        return False
+
+    @staticmethod
+    def ida_star_search(
+        grid: list[list[Vertex]],
+        start: Vertex,
+        destination: Vertex,
+        table_size: int = 4096,
+    ) -> Generator[tuple[Vertex, int], None, bool | None]:
+        """Runs IDA* search.
+
+        Depth-first search is repeated with a growing bound on the f-cost, so
+        apart from the current path only a transposition table is kept. It holds
+        the lowest g-cost each vertex was reached with and the iteration that
+        happened in. Vertices reached on a longer path, or on an equally long one
+        they were already searched from in this iteration, are skipped. Once the
+        table holds table_size vertices, the oldest entry is evicted.
+
+        The search stops without a path once the bound exceeds the number of open
+        vertices, which no path can be longer than. It gives up and returns None
+        if a single iteration expands more than _GIVE_UP_FACTOR times as many
+        vertices as are open (and at least _MIN_EXPANSIONS), since then the table
+        is too small for the region being searched.
+        """
+        if start == destination:
+            return True
+
+        bound = AStarSearch.manhatten_distance(start, destination)
+        table = {}
+        iteration = 0
+        total_expansions = 0
+        open_vertices = None
+
+        while bound != float('inf'):
+            path = [start]
+            on_path = {start}
+            neighbors = [iter(start.neighbors)]
+            next_bound = float('inf')
+            iteration += 1
+            expansions = 0
+
+            while neighbors:
+                neighbor = next(neighbors[-1], None)
+
+                if neighbor is None:
+                    neighbors.pop()
+                    on_path.discard(path.pop())
+                    continue
+
+                if neighbor in on_path:
+                    continue
+
+                g_score = len(path)
+                entry = table.get(neighbor)
+                if entry and (entry[0] < g_score or entry == (g_score, iteration)):
+                    continue
+
+                f_score = g_score + AStarSearch.manhatten_distance(neighbor, destination)
+                if f_score > bound:
+                    next_bound = min(next_bound, f_score)
+                    continue
+
+                if neighbor == destination:
+                    came_from = dict(zip(path[1:] + [destination], path))
+                    yield from Path.reconstruct(came_from, destination)
+                    start.make_start()
+                    return True
+
+                if not entry and len(table) >= table_size:
+                    del table[next(iter(table))]
+
+                table[neighbor] = (g_score, iteration)
+                path.append(neighbor)
+                on_path.add(neighbor)
+                neighbors.append(iter(neighbor.neighbors))
+                neighbor.make_visited()
+                expansions += 1
+
+                yield neighbor, len(path)
+
+                if expansions > _MIN_EXPANSIONS:
+                    open_vertices = open_vertices or start.count_open_vertices()
+                    if bound > open_vertices:
+                        return False
+                    if expansions > _GIVE_UP_FACTOR * open_vertices:
+                        return None
+
+            bound = next_bound
+            total_expansions += expansions
+
+            if total_expansions > _MIN_EXPANSIONS:
+                open_vertices = open_vertices or start.count_open_vertices()
+                if bound > open_vertices:
+                    return False
+
+        return False
+
+    @staticmethod
+    def sma_star_search(
+        grid: list[list[Vertex]],
+        start: Vertex,
+        destination: Vertex,
+        node_budget: int = 1024,
+    ) -> Generator[tuple[Vertex, int], None, bool | None]:
+        """Runs simplified memory-bounded A* (SMA*) search.
+
+        Like A*, but at most node_budget nodes of the search tree are held in
+        memory and successors are generated one at a time. When memory is full,
+        the shallowest leaf with the highest f-cost is forgotten and its parent
+        remembers that cost, so it can be regenerated once the parent is the most
+        promising node again. Paths longer than the budget can't be found.
+
+        The search stops without a path once the lowest f-cost is too high for a
+        path to exist or fit into the budget. It gives up and returns None after
+        generating _GIVE_UP_FACTOR times as many nodes as there are open vertices
+        (and at least _MIN_EXPANSIONS), which happens when the same nodes are
+        forgotten and regenerated over and over.
+        """
+        root = SearchNode(start, None, 0, AStarSearch.manhatten_distance(start, destination))
+        frontier = {root}
+        leaves = SearchLeaves()
+        leaves.add(root)
+        table = {start: root}
+        queue = [(root.f, 0, root)]
+        size = 1
+        max_cost = node_budget - 1
+        open_vertices = None
+        generations = 0
+
+        while frontier:
+            f_score, _, best = heappop(queue)
+            if best not in frontier or f_score != best.f: continue
+
+            if generations > _MIN_EXPANSIONS and open_vertices is None:
+                open_vertices = start.count_open_vertices()
+                max_cost = min(max_cost, open_vertices - 1)
+
+            if best.f > max_cost:
+                return False
+
+            if best.vertex == destination:
+                came_from = {}
+                node = best
+                while node.parent:
+                    came_from[node.vertex] = node.parent.vertex
+                    node = node.parent
+
+                yield from Path.reconstruct(came_from, destination)
+                start.make_start()
+                return True
+
+            if not best.pending:
+                frontier.discard(best)
+                continue
+
+            generations += 1
+            if open_vertices and generations > _GIVE_UP_FACTOR * open_vertices:
+                return None
+
+            vertex, f_score = best.pending.pop(0)
+            g_score = best.g + 1
+            duplicate = table.get(vertex)
+            successor = None
+
+            # Skip vertices held in memory on an equal or shorter path, and paths too long to hold
+            if (not duplicate or duplicate.g > g_score) and (g_score < node_budget - 1 or vertex == destination):
+                if f_score is None:
+                    f_score = g_score + AStarSearch.manhatten_distance(vertex, destination)
+                successor = SearchNode(vertex, best, g_score, max(best.f, f_score))
+
+                if not successor.pending and vertex != destination:
+                    successor = None
+
+            if successor and size >= node_budget:
+                worst = leaves.worst(best)
+
+                if worst:
+                    SMAStarSearch.forget(worst, frontier, leaves, queue, table)
+                    size -= 1
+                else:
+                    successor = None
+
+            if successor:
+                best.children.append(successor)
+                leaves.discard(best)
+                leaves.add(successor)
+                frontier.add(successor)
+                table[vertex] = successor
+                heappush(queue, (successor.f, -successor.g, successor))
+                size += 1
+
+            if not best.pending:
+                frontier.discard(best)
+
+            SMAStarSearch.backup(best, frontier, queue)
+            leaves.update(best)
+            if best in frontier:
+                heappush(queue, (best.f, -best.g, best))
+
+            # Drop outdated entries so the queue stays within the budget as well
+            if len(queue) > 4 * node_budget:
+                queue = [(node.f, -node.g, node) for node in frontier]
+                heapify(queue)
+
+            if best.vertex != start:
+                best.vertex.make_visited()
+
+            yield best.vertex, len(frontier)
 
         return False
@@ -0,0 +1,204 @@
+"""Races several pathfinding algorithms against each other on the same grid.
+
+Every algorithm runs on its own copy of the grid, shown in its own pane. Only
+the states are copied, the vertices of a copy are created once an algorithm
+reaches them, so starting a race on a large grid is cheap. The runners are
+advanced either in lockstep, one step each per frame, or by equal time
+budgets, so that faster algorithms also get further in the same time.
+Each pane shows live counters for the expanded vertices, the size of the
+frontier, the time spent inside the algorithm and, once done, the path cost.
+
+Typical usage example:
+    race = Race(window, states, rows, cols, start, destination, algorithms)
+    while not race.is_finished():
+        race.step()
+        race.draw()
+"""
+from __future__ import annotations
+from math import ceil, sqrt
+from time import perf_counter
+import numpy as np
+import pygame
+from pathfinder import Pathfinder
+from render import render_states
+from vertex import lazy_grid
+from utils import Algorithms, Colors, States
+
+# Height of the metrics shown above each pane in pixels
+_HEADER_HEIGHT = 36
+
+# Labels of algorithms whose names don't read well in title case
+_LABELS = {
+    Algorithms.DIJKTRA: "Dijkstra's algorithm",
+    Algorithms.A_STAR_SEARCH: 'A* search',
+    Algorithms.IDA_STAR_SEARCH: 'IDA* search',
+    Algorithms.SMA_STAR_SEARCH: 'SMA* search',
+}
+
+
+class Runner:
+    """Class which runs one algorithm on its own copy of the grid and measures it.
+
+    Attributes:
+        algorithm: The algorithm being run.
+        state_array: A (rows, cols) array view of the states of the copy.
+        frontier: The size of the frontier after the latest step.
+        seconds: The time spent inside the algorithm.
+        finished: Whether the algorithm is done.
+        found: Whether a path was found, None while running or if the algorithm gave up.
+        _steps: The generator running the algorithm.
+        _is_empty_path: Whether start and destination are the same vertex.
+    """
+
+    def __init__(
+        self,
+        algorithm: Algorithms,
+        states: bytearray,
+        rows: int,
+        cols: int,
+        start: tuple[int, int],
+        destination: tuple[int, int],
+    ) -> None:
+        """Copies the states of the grid and prepares the algorithm."""
+        states = bytearray(states)
+        grid = lazy_grid(states, rows, cols)
+
+        self.algorithm = algorithm
+        self.state_array = np.frombuffer(states, dtype=np.uint8).reshape(rows, cols)
+        self.frontier = 1
+        self.seconds = 0.0
+        self.finished = False
+        self.found = None
+        self._is_empty_path = start == destination
+        self._steps = Pathfinder.run(algorithm, grid, grid[start[0]][start[1]], grid[destination[0]][destination[1]])
+
+    def step(self, count: int = 1) -> None:
+        """Advances the algorithm by a number of steps."""
+        started = perf_counter()
+
+        try:
+            for _ in range(count):
+                _, self.frontier = next(self._steps)
+        except StopIteration as stop:
+            self.finished = True
+            self.found = stop.value
+            self.frontier = 0
+
+        self.seconds += perf_counter() - started
+
+    def run_for(self, budget: float) -> None:
+        """Advances the algorithm until it used up a time budget in seconds."""
+        deadline = self.seconds + budget
+
+        while not self.finished and self.seconds < deadline:
+            self.step(16)
+
+    def expanded(self) -> int:
+        """Returns the number of vertices the algorithm expanded so far."""
+        return int(np.count_nonzero((self.state_array == States.VISITED) | (self.state_array == States.PATH)))
+
+    def cost(self) -> int | None:
+        """Returns the cost of the path found, or None if there is none (yet)."""
+        if not self.found: return None
+        if self._is_empty_path: return 0
+        return int(np.count_nonzero(self.state_array == States.PATH)) + 1
+
+
+class Race:
+    """Class which races several algorithms in split panes.
+
+    Attributes:
+        lockstep: Whether runners advance by steps rather than time budgets.
+        runners: The runners, one per algorithm.
+        _window: The surface the panes are drawn on.
+        _panes: The area of each pane, below its header.
+        _zoom: The width of a vertex in pixels inside a pane.
+        _steps_per_frame: The steps each runner takes per frame in lockstep.
+        _budget: The time each runner gets per frame otherwise.
+        _font: The font of the metrics.
+    """
+
+    def __init__(
+        self,
+        window: pygame.Surface,
+        states: bytearray,
+        rows: int,
+        cols: int,
+        start: tuple[int, int],
+        destination: tuple[int, int],
+        algorithms: list[Algorithms],
+        budget: float = 0.004,
+    ) -> None:
+        """Initializes the race.
+
+        Args:
+            window: The surface the panes are drawn on.
+            states: The states of the grid, which are copied for every algorithm.
+            rows: The number of rows of the grid.
+            cols: The number of columns of the grid.
+            start: Position of the start vertex.
+            destination: Position of the destination vertex.
+            algorithms: The algorithms to race.
+            budget: Seconds each runner may spend per frame when not in lockstep.
+        """
+        self.lockstep = True
+        self.runners = [Runner(algorithm, states, rows, cols, start, destination) for algorithm in algorithms]
+        self._window = window
+        self._steps_per_frame = max(1, rows * cols // 2500)
+        self._budget = budget
+
+        pygame.font.init()
+        self._font = pygame.font.Font(None, 18)
+
+        pane_cols = ceil(sqrt(len(algorithms)))
+        pane_rows = ceil(len(algorithms) / pane_cols)
+        width = window.get_width() // pane_cols
+        height = window.get_height() // pane_rows
+        self._zoom = min(width / rows, (height - _HEADER_HEIGHT) / cols)
+        self._panes = [
+            pygame.Rect(
+                (i % pane_cols) * width, (i // pane_cols) * height + _HEADER_HEIGHT, width, height - _HEADER_HEIGHT)
+            for i in range(len(algorithms))
+        ]
+
+    def is_finished(self) -> bool:
+        """Checks if every algorithm is done."""
+        return all(runner.finished for runner in self.runners)
+
+    def step(self) -> None:
+        """Advances every unfinished algorithm by one frame."""
+        for runner in self.runners:
+            if runner.finished: continue
+
+            if self.lockstep:
+                runner.step(self._steps_per_frame)
+            else:
+                runner.run_for(self._budget)
+
+    def draw(self) -> None:
+        """Draws every pane with its metrics."""
+        self._window.fill(Colors.LIGHT_BLUE)
+
+        for runner, pane in zip(self.runners, self._panes):
+            self._window.blit(render_states(runner.state_array, self._zoom), pane.topleft)
+
+            if not runner.finished:
+                status = 'running'
+            elif runner.found:
+                status = f'cost {runner.cost()}'
+            else:
+                status = 'gave up' if runner.found is None else 'no path'
+
+            label = _LABELS.get(runner.algorithm, runner.algorithm.name.replace('_', ' ').capitalize())
+            lines = (
+                f'{label}: {status}',
+                f'expanded {runner.expanded()}  frontier {runner.frontier}  {runner.seconds * 1000:.1f} ms',
+            )
+
+            for i, line in enumerate(lines):
+                text = self._font.render(line, True, Colors.BLACK)
+                self._window.blit(text, (pane.left + 4, pane.top - _HEADER_HEIGHT + 3 + 16 * i))
+
+        mode = 'lockstep' if self.lockstep else 'equal time'
+        text = self._font.render(f'{mode} (t to switch, esc to leave)', True, Colors.BLACK)
+        self._window.blit(text, (self._window.get_width() - text.get_width() - 4, self._window.get_height() - 16))
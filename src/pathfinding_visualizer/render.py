@@ -0,0 +1,36 @@
+"""Renders the states of a grid to pygame surfaces.
+
+The states are mapped to colors in one vectorized pass and turned into a
+surface with pygame.surfarray. When several vertices share a pixel, blocks of
+vertices are aggregated first, keeping the most important state among them,
+so the cost of rendering depends on the size of the output, not of the grid.
+"""
+import numpy as np
+import pygame
+from utils import Colors
+
+# Colors of the vertex states, indexed by state
+_PALETTE = np.array([
+    Colors.WHITE,
+    Colors.BLUE[:3],
+    Colors.BLACK,
+    Colors.YELLOW,
+    Colors.GREEN,
+    Colors.RED,
+], dtype=np.uint8)
+
+
+def render_states(states: np.ndarray, zoom: float) -> pygame.Surface:
+    """Renders a (rows, cols) array of states with zoom pixels per vertex."""
+    step = max(1, int(1 / zoom))
+
+    # Aggregate blocks of vertices sharing a pixel, states are ordered by importance
+    if step > 1:
+        rows = -(-states.shape[0] // step) * step
+        cols = -(-states.shape[1] // step) * step
+        states = np.pad(states, ((0, rows - states.shape[0]), (0, cols - states.shape[1])))
+        states = states.reshape(rows // step, step, cols // step, step).max(axis=(1, 3))
+
+    surface = pygame.surfarray.make_surface(_PALETTE[states])
+    size = (max(1, round(states.shape[0] * step * zoom)), max(1, round(states.shape[1] * step * zoom)))
+    return pygame.transform.scale(surface, size)
@@ -1,6 +1,8 @@
 """Pathfinding visualizer utils."""
 from __future__ import annotations
-from enum import Enum, auto
+from collections.abc import Iterator
+from enum import Enum, IntEnum, auto
+from heapq import heappop, heappush
 from queue import deque
 
 
@@ -10,6 +12,25 @@ class Algorithms(Enum):
     BIDIRECTIONAL_SEARCH = auto()
     BREADTH_FIRST_SEARCH = auto()
     DEPTH_FIRST_SEARCH = auto()
+    IDA_STAR_SEARCH = auto()
+    SMA_STAR_SEARCH = auto()
+
+
+class Mazes(Enum):
+    RANDOM_OBSTACLES = auto()
+    RECURSIVE_BACKTRACKER = auto()
+    KRUSKAL = auto()
+    CAVES = auto()
+
+
+class States(IntEnum):
+    """States of a vertex, ordered by how important it is to show them."""
+    EMPTY = 0
+    VISITED = 1
+    WALL = 2
+    PATH = 3
+    START = 4
+    DESTINATION = 5
 
 
 class Colors:
@@ -20,46 +41,42 @@ class Colors:
     GREEN = (50, 205, 50)
     BLUE = (0, 190, 218, 0.75)
     LIGHT_BLUE = (175, 216, 248)
+    PURPLE = (128, 0, 128)
+    ORANGE = (255, 165, 0)
 
 
 class Path:
     """Helper class for reconstructing paths."""
 
     @staticmethod
-    def reconstruct(
-        gui: object,
-        grid: list[list[object]],
-        came_from: dict[object, object],
-        destination: object,
-    ) -> None:
-        """Reconstructs the shortest path."""
+    def reconstruct(came_from: dict[object, object], destination: object) -> Iterator[tuple[object, int]]:
+        """Reconstructs the shortest path, yielding every vertex added to it and an empty frontier."""
         current = destination
         while current in came_from:
             current = came_from[current]
             current.make_path()
-            gui.draw(grid)
+            yield current, 0
 
     @staticmethod
     def reconstruct_bidirectional(
-        gui: object,
-        grid: list[list[object]],
         came_from_src: dict[object, object],
         came_from_dst: dict[object, object],
         intersection: object,
-    ) -> None:
-        """Reconstructs the shortest path."""
+    ) -> Iterator[tuple[object, int]]:
+        """Reconstructs the shortest path, yielding every vertex added to it and an empty frontier."""
         intersection.make_path()
+        yield intersection, 0
         current_src = intersection
         current_dst = intersection
         while current_src in came_from_src or current_dst in came_from_dst:
             if current_src in came_from_src:
                 current_src = came_from_src[current_src]
                 current_src.make_path()
+                yield current_src, 0
             if current_dst in came_from_dst:
                 current_dst = came_from_dst[current_dst]
                 current_dst.make_path()
-                
-            gui.draw(grid)
+                yield current_dst, 0
 
 
 class AStarSearch:
@@ -73,19 +90,136 @@ class AStarSearch:
         return abs(x1 - x2) + abs(y1 - y2)
 
 
+class SearchNode:
+    """Class which represents a node of the search tree kept by SMA* search.
+
+    Attributes:
+        vertex: The vertex the node reaches.
+        parent: The node it was generated from, or None for the root.
+        g: The length of the path from the start.
+        f: The estimated cost of a path through the node, backed up from its successors.
+        children: The successors held in memory.
+        pending: The successors still to generate, with the f-cost of forgotten ones.
+    """
+    __slots__ = ('vertex', 'parent', 'g', 'f', 'children', 'pending')
+
+    def __init__(self, vertex: object, parent: SearchNode | None, g: int, f: float) -> None:
+        self.vertex = vertex
+        self.parent = parent
+        self.g = g
+        self.f = f
+        self.children = []
+        self.pending = [(neighbor, None) for neighbor in vertex.neighbors if not parent or neighbor != parent.vertex]
+
+    def __lt__(self, other: SearchNode) -> bool:
+        return False
+
+
+class SearchLeaves:
+    """Class which holds the leaves of the search tree kept by SMA* search.
+
+    The leaves are kept in a heap ordered by how little they are worth keeping,
+    so the next one to forget is found without looking at all of them. Entries
+    of nodes which stopped being leaves or changed their f-cost are skipped.
+
+    Attributes:
+        _leaves: The current leaves.
+        _queue: Heap of (-f, g, node) entries, possibly outdated.
+    """
+
+    def __init__(self) -> None:
+        self._leaves = set()
+        self._queue = []
+
+    def add(self, node: SearchNode) -> None:
+        """Adds a leaf."""
+        self._leaves.add(node)
+        heappush(self._queue, (-node.f, node.g, node))
+
+    def discard(self, node: SearchNode) -> None:
+        """Removes a node if it is a leaf."""
+        self._leaves.discard(node)
+
+    def update(self, node: SearchNode) -> None:
+        """Reorders a node after its f-cost changed, if it is a leaf."""
+        if node in self._leaves:
+            heappush(self._queue, (-node.f, node.g, node))
+
+    def worst(self, keep: SearchNode) -> SearchNode | None:
+        """Returns the shallowest leaf with the highest f-cost apart from keep and the root, if any."""
+        skipped = []
+        worst = None
+
+        while self._queue and worst is None:
+            f, _, node = self._queue[0]
+
+            if node not in self._leaves or -f != node.f:
+                heappop(self._queue)
+            elif node is keep or not node.parent:
+                skipped.append(heappop(self._queue))
+            else:
+                worst = node
+
+        for entry in skipped:
+            heappush(self._queue, entry)
+
+        return worst
+
+    def __contains__(self, node: SearchNode) -> bool:
+        return node in self._leaves
+
+
+class SMAStarSearch:
+    """Helper class for visualizing SMA* search."""
+
+    @staticmethod
+    def backup(node: SearchNode, frontier: set[SearchNode], queue: list[tuple[float, int, SearchNode]]) -> None:
+        """Updates the f-cost of a node and its ancestors once all their successors were generated."""
+        while node and all(f is not None for _, f in node.pending):
+            f = min([child.f for child in node.children] + [f for _, f in node.pending], default=float('inf'))
+            if f == node.f: return
+
+            node.f = f
+            if node in frontier:
+                heappush(queue, (node.f, -node.g, node))
+            node = node.parent
+
+    @staticmethod
+    def forget(
+        node: SearchNode,
+        frontier: set[SearchNode],
+        leaves: SearchLeaves,
+        queue: list[tuple[float, int, SearchNode]],
+        table: dict[object, SearchNode],
+    ) -> None:
+        """Removes a leaf from memory, remembering its f-cost in its parent."""
+        frontier.discard(node)
+        leaves.discard(node)
+        if table.get(node.vertex) is node:
+            del table[node.vertex]
+
+        parent = node.parent
+        parent.children.remove(node)
+        if node.f != float('inf'):
+            parent.pending.append((node.vertex, node.f))
+        if not parent.children:
+            leaves.add(parent)
+        if parent not in frontier and parent.pending:
+            frontier.add(parent)
+            heappush(queue, (parent.f, -parent.g, parent))
+
+
 class BidirectionalSearch:
     """Helper class for visualizing bidirectional search."""
 
     @staticmethod
     def bfs(
-        gui: object,
-        grid: list[list[object]],
         goal: object,
         queue: deque[object],
         visited: set[object],
         came_from: dict[object, object],
-    ) -> None:
-        """Runs breadth-first search."""
+    ) -> object:
+        """Runs one step of breadth-first search and returns the expanded vertex."""
         current = queue.popleft()
         visited.add(current)
 
@@ -98,7 +232,7 @@ class BidirectionalSearch:
         if current != goal:
             current.make_visited()
 
-        gui.draw(grid)
+        return current
 
     @staticmethod
     def is_intersecting(visited_src: set[object], visited_dst: set[object]) -> set[object] | int:
@@ -9,37 +9,52 @@ Depending on the state, a vertex will be colored differently:
 - visited vertices: blue
 - shortest path: yellow
 
-Addionally a vertex belongs to a row and column in the grid,
-has x, y coordinates, a width, and has access to all of its neighbors.
+Addionally a vertex belongs to a row and column in the grid
+and has access to all of its neighbors.
+
+The states of all vertices of a grid live in one shared array of bytes, one per
+vertex in row-major order. The GUI renders the grid straight from that array,
+so drawing doesn't have to visit every vertex object. Neighbors are read from
+the array whenever they are requested, so changing walls never requires a pass
+over the whole grid. The rows of a grid create their vertices the first time
+they are accessed, so a grid costs nothing until a vertex is needed.
 """
 from __future__ import annotations
-import pygame
-from utils import Colors
+from utils import States
+
+_WALL = int(States.WALL)
 
 
 class Vertex:
     """Class which represents a vertex (cell) in the grid.
 
     Attributes:
-        neighbors: Neighbors of the vertex.
-        _color: Color of the vertex indicates its state.
+        _grid: The grid the vertex belongs to, indexed by row and column.
+        _states: The states of all vertices of the grid.
+        _index: Index of the vertex in the states.
         _row: Row of the vertex.
         _col: Column of the vertex.
-        _x: x coordinate of the vertex.
-        _y: y coordinate of the vertex.
-        _width: Width of the vertex.
         _total_rows: Total rows of the grid.
+        _total_cols: Total columns of the grid.
     """
-
-    def __init__(self, row: int, col: int, width: int, total_rows: int) -> None:
-        self.neighbors = []
-        self._color = Colors.WHITE
+    __slots__ = ('_grid', '_states', '_index', '_row', '_col', '_total_rows', '_total_cols')
+
+    def __init__(
+        self,
+        row: int,
+        col: int,
+        states: bytearray,
+        total_rows: int,
+        total_cols: int,
+        grid: list[list[Vertex]],
+    ) -> None:
+        self._grid = grid
+        self._states = states
+        self._index = row * total_cols + col
         self._row = row
         self._col = col
-        self._x = row * width
-        self._y = col * width
-        self._width = width
         self._total_rows = total_rows
+        self._total_cols = total_cols
 
     def get_position(self) -> tuple[int, int]:
         """Returns the position of the vertex."""
@@ -47,63 +62,98 @@ class Vertex:
 
     def is_wall(self) -> bool:
         """Checks if the vertex is a wall."""
-        return self._color == Colors.BLACK
+        return self._states[self._index] == States.WALL
 
     def is_visited(self) -> bool:
         """Checks if the state of the vertex is visited."""
-        return self._color == Colors.BLUE
+        return self._states[self._index] == States.VISITED
 
     def is_path(self) -> bool:
         """Checks if the vertex belongs to the shortest path."""
-        return self._color == Colors.YELLOW
+        return self._states[self._index] == States.PATH
+
+    def count_open_vertices(self) -> int:
+        """Counts the vertices of the grid which are not walls."""
+        return len(self._states) - self._states.count(States.WALL)
 
     def reset_vertex(self) -> None:
         """Resets the vertex by coloring it white."""
-        self._color = Colors.WHITE
+        self._states[self._index] = States.EMPTY
 
     def make_start(self) -> None:
         """Colors the vertex green if it's the start."""
-        self._color = Colors.GREEN
+        self._states[self._index] = States.START
 
     def make_destination(self) -> None:
         """Colors the vertex red if it's the destination."""
-        self._color = Colors.RED
+        self._states[self._index] = States.DESTINATION
 
     def make_visited(self) -> None:
         """Colors the vertex blue if the algorithm has visited it."""
-        self._color = Colors.BLUE
+        self._states[self._index] = States.VISITED
 
     def make_wall(self) -> None:
         """Colors the vertex black if it's a wall."""
-        self._color = Colors.BLACK
+        self._states[self._index] = States.WALL
 
     def make_path(self) -> None:
         """Colors the vertex yellow if it belongs to the shortest path."""
-        self._color = Colors.YELLOW
-
-    def draw(self, window: pygame.display) -> None:
-        """Draws the vertex."""
-        pygame.draw.rect(window, self._color, (self._x, self._y, self._width, self._width))
+        self._states[self._index] = States.PATH
 
-    def update_neighbors(self, grid: list[list[Vertex]]) -> None:
-        """Updates all neighbors of a vertex."""
-        self.neighbors = []
+    @property
+    def neighbors(self) -> list[Vertex]:
+        """Neighbors of the vertex which are not walls."""
+        grid, states, index, row, col = self._grid, self._states, self._index, self._row, self._col
+        neighbors = []
 
         # Vertex below
-        if self._row < self._total_rows - 1 and not grid[self._row + 1][self._col].is_wall():
-            self.neighbors.append(grid[self._row + 1][self._col])
+        if row < self._total_rows - 1 and states[index + self._total_cols] != _WALL:
+            neighbors.append(grid[row + 1][col])
 
         # Vertex above
-        if self._row > 0 and not grid[self._row - 1][self._col].is_wall():
-            self.neighbors.append(grid[self._row - 1][self._col])
+        if row > 0 and states[index - self._total_cols] != _WALL:
+            neighbors.append(grid[row - 1][col])
 
         # Vertex to the right
-        if self._col < self._total_rows - 1 and not grid[self._row][self._col + 1].is_wall():
-            self.neighbors.append(grid[self._row][self._col + 1])
+        if col < self._total_cols - 1 and states[index + 1] != _WALL:
+            neighbors.append(grid[row][col + 1])
 
         # Vertex to the left
-        if self._col > 0 and not grid[self._row][self._col - 1].is_wall():
-            self.neighbors.append(grid[self._row][self._col - 1])
+        if col > 0 and states[index - 1] != _WALL:
+            neighbors.append(grid[row][col - 1])
+
+        return neighbors
 
     def __lt__(self, other: Vertex) -> bool:
         return False
+
+
+class LazyRow(dict):
+    """A row of a grid which creates each vertex the first time it is accessed.
+
+    Attributes:
+        _row: The index of the row.
+        _states: The states of all vertices of the grid.
+        _rows: The number of rows of the grid.
+        _cols: The number of columns of the grid.
+        _grid: The grid the row belongs to.
+    """
+
+    def __init__(self, row: int, states: bytearray, rows: int, cols: int, grid: list[LazyRow]) -> None:
+        super().__init__()
+        self._row = row
+        self._states = states
+        self._rows = rows
+        self._cols = cols
+        self._grid = grid
+
+    def __missing__(self, col: int) -> Vertex:
+        vertex = self[col] = Vertex(self._row, col, self._states, self._rows, self._cols, self._grid)
+        return vertex
+
+
+def lazy_grid(states: bytearray, rows: int, cols: int) -> list[LazyRow]:
+    """Returns a grid over the states whose vertices are created once they are accessed."""
+    grid = []
+    grid.extend(LazyRow(row, states, rows, cols, grid) for row in range(rows))
+    return grid
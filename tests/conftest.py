@@ -0,0 +1,5 @@
+"""Makes the modules of the dijkstra package importable the way its scripts import them."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src', 'dijkstra'))
@@ -0,0 +1,132 @@
+"""Tests the query service through its client on an ephemeral port."""
+import asyncio
+import json
+import pytest
+from data_structures import Edge, Graph, Vertex
+from service import QueryClient, QueryService
+
+
+@pytest.fixture(scope='module')
+def graph() -> Graph:
+    v_a = Vertex('A')
+    v_b = Vertex('B')
+    v_c = Vertex('C')
+    v_d = Vertex('D')
+    v_e = Vertex('E')
+    v_f = Vertex('F')
+    v_g = Vertex('G')
+    vertices = {v_a, v_b, v_c, v_d, v_e, v_f, v_g}
+
+    edges = {
+        Edge(v_a, v_b, 7),
+        Edge(v_a, v_c, 9),
+        Edge(v_a, v_f, 14),
+        Edge(v_b, v_c, 10),
+        Edge(v_b, v_d, 15),
+        Edge(v_c, v_d, 11),
+        Edge(v_c, v_f, 2),
+        Edge(v_d, v_e, 6),
+        Edge(v_f, v_e, 9),
+    }
+
+    return Graph(vertices, edges)
+
+
+def run_with_client(graph: Graph, scenario) -> dict:
+    """Runs a scenario against a fresh service and returns the service's statistics afterwards."""
+    async def main() -> dict:
+        service = QueryService(graph, workers=1, batch_delay=0.05)
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = await QueryClient.connect('127.0.0.1', port)
+
+        try:
+            await scenario(service, client, port)
+            return await client.stats()
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+    return asyncio.run(main())
+
+
+def test_query(graph: Graph) -> None:
+    async def scenario(service, client, port):
+        assert await client.query('A', 'E') == (20, ['A', 'C', 'F', 'E'])
+        assert await client.query('E', 'A') == (None, [])
+
+    stats = run_with_client(graph, scenario)
+    assert stats['queries'] == 2
+    assert stats['errors'] == 0
+
+
+def test_identical_queries_are_coalesced(graph: Graph) -> None:
+    async def scenario(service, client, port):
+        results = await asyncio.gather(*(client.query('A', 'E') for _ in range(5)))
+        assert results == [(20, ['A', 'C', 'F', 'E'])] * 5
+
+    stats = run_with_client(graph, scenario)
+    assert stats['queries'] == 5
+    assert stats['coalesced'] == 4
+    assert stats['searches'] == 1
+
+
+def test_queries_sharing_a_source_are_batched(graph: Graph) -> None:
+    async def scenario(service, client, port):
+        results = await asyncio.gather(client.query('A', 'D'), client.query('A', 'E'), client.query('B', 'D'))
+        assert results == [(20, ['A', 'C', 'D']), (20, ['A', 'C', 'F', 'E']), (15, ['B', 'D'])]
+
+    stats = run_with_client(graph, scenario)
+    assert stats['queries'] == 3
+    assert stats['coalesced'] == 0
+    assert stats['searches'] == 2
+
+
+def test_cancelled_queries_dont_affect_others(graph: Graph) -> None:
+    async def scenario(service, client, port):
+        others = asyncio.gather(service.query('A', 'E'), service.query('A', 'D'))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(service.query('A', 'E'), 0.01)
+
+        results = await asyncio.wait_for(others, 5)
+        assert results == [(20, ['A', 'C', 'F', 'E']), (20, ['A', 'C', 'D'])]
+
+    stats = run_with_client(graph, scenario)
+    assert stats['coalesced'] == 1
+    assert stats['searches'] == 1
+
+
+def test_invalid_requests_get_error_responses(graph: Graph) -> None:
+    async def scenario(service, client, port):
+        with pytest.raises(LookupError, match='KeyError'):
+            await client.query('A', 'X')
+
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        requests = [
+            b'{"id": 9, "source": [1], "destination": "1"}\n',
+            b'{"id": 10, "source": "A"}\n',
+            b'[1, 2]\n',
+            b'not json\n',
+        ]
+        writer.write(b''.join(requests))
+        await writer.drain()
+        responses = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for _ in requests]
+        writer.close()
+
+        errors = sorted((response['id'] is None, response['error'].split(':')[0]) for response in responses)
+        assert errors == [(False, 'KeyError'), (False, 'TypeError'), (True, 'AttributeError'), (True, 'JSONDecodeError')]
+
+    stats = run_with_client(graph, scenario)
+    assert stats['errors'] == 5
+
+
+def test_worker_failures_get_error_responses(graph: Graph) -> None:
+    async def scenario(service, client, port):
+        service.close()
+        with pytest.raises(LookupError, match='RuntimeError'):
+            await asyncio.wait_for(client.query('A', 'E'), 5)
+
+    stats = run_with_client(graph, scenario)
+    assert stats['errors'] == 1